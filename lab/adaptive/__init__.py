@@ -4,4 +4,12 @@ from .online_learner import OnlineLearner, OnlineLearnerState  # noqa: F401
 from .regime_classifier import classify_regime  # noqa: F401
 from .vol_targeter import compute_target_scalar  # noqa: F401
 from .watchdog import Watchdog, WatchdogConfig  # noqa: F401
-from .persistence import load_pickle, save_pickle, save_json, load_json  # noqa: F401
+from .persistence import (  # noqa: F401
+    load_json,
+    load_pickle,
+    load_state,
+    load_state_json,
+    save_json,
+    save_pickle,
+    save_state_json,
+)
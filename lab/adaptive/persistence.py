@@ -9,6 +9,13 @@ import tempfile
 from dataclasses import asdict, is_dataclass
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; stdlib json reads and writes the same documents
+    orjson = None
+
+from .online_learner import OnlineLearnerState
+
 
 def _atomic_write(path: str, data: bytes) -> None:
     """Write *data* to *path* atomically."""
@@ -59,3 +66,34 @@ def load_json(path: str) -> Any:
     """Load JSON data from *path*."""
     with open(path, "r", encoding="utf-8") as handle:
         return json.load(handle)
+
+
+def save_state_json(path: str, state: OnlineLearnerState) -> None:
+    """Persist an :class:`OnlineLearnerState` as compact JSON with an atomic write.
+
+    Faster and safer to reload than :func:`save_pickle`, which stays available for
+    state files written by older runs.
+    """
+    data = asdict(state)
+    data["bounds"] = {k: list(v) for k, v in state.bounds.items()}
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY)
+    else:
+        payload = json.dumps(data, separators=(",", ":")).encode("utf-8")
+    _atomic_write(path, payload)
+
+
+def load_state_json(path: str) -> OnlineLearnerState:
+    """Rebuild an :class:`OnlineLearnerState` written by :func:`save_state_json`."""
+    with open(path, "rb") as handle:
+        raw = handle.read()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+    data["bounds"] = {k: tuple(v) for k, v in data.get("bounds", {}).items()}
+    return OnlineLearnerState(**data)
+
+
+def load_state(path: str) -> OnlineLearnerState:
+    """Load learner state saved by :func:`save_state_json`; ``.pkl`` files from older runs are unpickled."""
+    if str(path).endswith((".pkl", ".pickle")):
+        return load_pickle(path)
+    return load_state_json(path)
@@ -17,17 +17,45 @@ from typing import Sequence, Dict, Any
 
 DEFAULT_UNIVERSE = ["SPY", "QQQ", "IWM", "EFA", "EEM", "TLT", "IEF", "LQD", "GLD", "SHY"]
 
-def _gbm_prices(seed, mu, sigma, start_price, idx):
-    rng = np.random.default_rng(seed)
+SCENARIOS = [
+    "trend_up", "trend_down", "mean_revert", "regime_switch",
+    "vol_spike", "jumps", "diversification_failure", "black_swan",
+]
+
+def _bdays(start, n):
+    # n business days from start (rolled forward), like date_range(freq="B") but via numpy's busday kernel
+    first = pd.Timestamp(start).to_datetime64().astype("datetime64[D]")
+    days = np.busday_offset(first, np.arange(n), roll="forward")
+    return pd.DatetimeIndex(days.astype("datetime64[ns]"))
+
+def _scenario_rng(seed_seq):
+    return np.random.Generator(np.random.PCG64DXSM(seed_seq))
+
+def _spawn_rngs(seed_seq, n):
+    # one independent PCG64DXSM stream per child of the scenario's SeedSequence
+    return [_scenario_rng(child) for child in seed_seq.spawn(n)]
+
+def _gbm_values(rng, mu, sigma, start_price, n):
+    # raw ndarray variant so callers can patch windows in place
     dt = 1/252
-    eps = rng.normal(loc=(mu*dt), scale=(sigma*np.sqrt(dt)), size=len(idx))
-    logret = eps
-    price = start_price * np.exp(np.cumsum(logret))
-    return pd.Series(price, index=idx)
+    logret = rng.normal(loc=(mu*dt), scale=(sigma*np.sqrt(dt)), size=n)
+    # in place: one n-length buffer instead of cumsum + exp temporaries
+    np.cumsum(logret, out=logret)
+    np.exp(logret, out=logret)
+    logret *= start_price
+    return logret
 
-def _mean_reverting_prices(seed, mu, sigma, theta, start_price, idx):
+def _gbm_panel(rng, mu_arr, sigma_arr, start_arr, n):
+    # (n, U) GBM paths in one draw; per-symbol parameters broadcast over columns
+    dt = 1/252
+    logret = rng.normal(loc=mu_arr*dt, scale=sigma_arr*np.sqrt(dt), size=(n, len(start_arr)))
+    np.cumsum(logret, axis=0, out=logret)
+    np.exp(logret, out=logret)
+    logret *= start_arr
+    return logret
+
+def _mean_reverting_prices(rng, mu, sigma, theta, start_price, idx):
     # Ornstein-Uhlenbeck discretization on log-price
-    rng = np.random.default_rng(seed)
     dt = 1/252
     x = np.log(start_price)
     out = []
@@ -37,8 +65,7 @@ def _mean_reverting_prices(seed, mu, sigma, theta, start_price, idx):
         out.append(np.exp(x))
     return pd.Series(out, index=idx)
 
-def _regime_switch_prices(seed, regimes, trans_mat, start_price, idx):
-    rng = np.random.default_rng(seed)
+def _regime_switch_prices(rng, regimes, trans_mat, start_price, idx):
     n = len(idx)
     k = len(regimes)
     states = np.zeros(n, dtype=int)
@@ -55,39 +82,57 @@ def _regime_switch_prices(seed, regimes, trans_mat, start_price, idx):
         price[t] = np.exp(logp)
     return pd.Series(price, index=idx)
 
-def _jumps_prices(seed, mu, sigma, jump_prob, jump_mu, jump_sigma, start_price, idx):
-    rng = np.random.default_rng(seed)
+def _jumps_panel(rng, mu, sigma, jump_prob, jump_mu, jump_sigma, start_arr, n):
+    # GBM drift plus Bernoulli-gated normal jumps, all symbols at once
     dt = 1/252
-    logp = np.log(start_price)
-    out = []
-    for _ in range(len(idx)):
-        jump = rng.random() < jump_prob
-        j = rng.normal(jump_mu, jump_sigma) if jump else 0.0
-        r = rng.normal(mu*dt, sigma*np.sqrt(dt))
-        logp = logp + r + j
-        out.append(np.exp(logp))
-    return pd.Series(out, index=idx)
+    shape = (n, len(start_arr))
+    logret = rng.normal(mu*dt, sigma*np.sqrt(dt), size=shape)
+    jumps = rng.normal(jump_mu, jump_sigma, size=shape)
+    jumps[rng.random(shape) >= jump_prob] = 0.0
+    logret += jumps
+    np.cumsum(logret, axis=0, out=logret)
+    np.exp(logret, out=logret)
+    logret *= start_arr
+    return logret
 
-def _correlated_basket(seed, mus, sigmas, corr, start_prices, idx):
-    rng = np.random.default_rng(seed)
+def _correlated_basket(rng, mus, sigmas, corr, start_prices, idx):
     dt = 1/252
     n = len(idx)
     k = len(mus)
     cov = np.outer(sigmas, sigmas) * corr
     L = np.linalg.cholesky(cov)
-    logp = np.log(np.array(start_prices))
-    out = np.zeros((n, k))
-    for t in range(n):
-        z = rng.normal(size=k)
-        eps = L @ z
-        logp = logp + (np.array(mus)*dt) + eps * np.sqrt(dt)
-        out[t] = np.exp(logp)
-    df = pd.DataFrame(out, index=idx, columns=[f"S{i}" for i in range(k)])
+    # same draw order as k normals per day, correlated in one matmul
+    incr = rng.normal(size=(n, k)) @ L.T
+    incr *= np.sqrt(dt)
+    incr += np.array(mus)*dt
+    np.cumsum(incr, axis=0, out=incr)
+    np.exp(incr, out=incr)
+    incr *= np.array(start_prices)
+    df = pd.DataFrame(incr, index=idx, columns=[f"S{i}" for i in range(k)])
     return df
 
 def _ensure_dir(p: Path):
     p.mkdir(parents=True, exist_ok=True)
 
+def _write_prices_csv(df: pd.DataFrame, path: Path, batch_size: int = 8192):
+    """Write a wide (Date, SYM...) frame in row batches so memory stays bounded."""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pac
+    except ImportError:
+        df.to_csv(path, index_label="Date", chunksize=batch_size)
+        return
+    dates = pa.array(df.index.values.astype("datetime64[D]"))
+    cols = [pa.array(df[c].to_numpy()) for c in df.columns]
+    tbl = pa.Table.from_arrays([dates, *cols], names=["Date", *map(str, df.columns)])
+    opts = pac.WriteOptions(include_header=False, quoting_style="needed")
+    with open(path, "wb") as f:
+        # header written by hand: Arrow always quotes column names
+        f.write((",".join(tbl.column_names) + "\n").encode("utf-8"))
+        with pac.CSVWriter(f, tbl.schema, write_options=opts) as writer:
+            for start in range(0, tbl.num_rows, batch_size):
+                writer.write_table(tbl.slice(start, batch_size))
+
 def generate_stress_zoo(
     outdir: str = "data/stress_zoo",
     universe: Sequence[str] | None = None,
@@ -110,7 +155,9 @@ def generate_stress_zoo(
     start_date : str
         Start date for the index.
     seed : int
-        RNG seed (reproducible).
+        Root seed; each scenario (and, for the path-dependent ones, each
+        symbol) gets its own stream spawned from ``np.random.SeedSequence(seed)``
+        so results are reproducible.
     verbose : bool
         If True print progress.
 
@@ -120,40 +167,40 @@ def generate_stress_zoo(
         Metadata about generated scenarios and file paths.
     """
     universe = list(universe or DEFAULT_UNIVERSE)
-    idx = pd.date_range(start=start_date, periods=n_days, freq="B")
+    idx = _bdays(start_date, n_days)
     out_root = Path(outdir)
     _ensure_dir(out_root)
 
-    start_prices = {s: float(80 + 40 * (i % 5)) for i, s in enumerate(universe)}
+    # per-symbol parameters as contiguous arrays (one entry per universe column)
+    pos = np.arange(len(universe))
+    start_arr = 80.0 + 40.0 * (pos % 5)
+    seed_seqs = dict(zip(SCENARIOS, np.random.SeedSequence(seed).spawn(len(SCENARIOS))))
 
     scenarios = {}
 
     # 1) trend_up (orangutan swinging up)
     if verbose: print("[zoo] generating trend_up")
-    trend_up = {}
-    for i, sym in enumerate(universe):
-        mu = 0.12 + 0.02 * (i % 3)    # modest positive drift
-        sigma = 0.12
-        trend_up[sym] = _gbm_prices(seed + i, mu, sigma, start_prices[sym], idx)
-    scenarios["trend_up"] = pd.DataFrame(trend_up)
+    mu_arr = 0.12 + 0.02 * (pos % 3)    # modest positive drift
+    sigma_arr = np.full(len(universe), 0.12)
+    panel = _gbm_panel(_scenario_rng(seed_seqs["trend_up"]), mu_arr, sigma_arr, start_arr, len(idx))
+    scenarios["trend_up"] = pd.DataFrame(panel, index=idx, columns=universe)
 
     # 2) trend_down (giraffe bending down slowly)
     if verbose: print("[zoo] generating trend_down")
-    trend_down = {}
-    for i, sym in enumerate(universe):
-        mu = -0.08 - 0.01 * (i % 2)
-        sigma = 0.12
-        trend_down[sym] = _gbm_prices(seed + 100 + i, mu, sigma, start_prices[sym], idx)
-    scenarios["trend_down"] = pd.DataFrame(trend_down)
+    mu_arr = -0.08 - 0.01 * (pos % 2)
+    sigma_arr = np.full(len(universe), 0.12)
+    panel = _gbm_panel(_scenario_rng(seed_seqs["trend_down"]), mu_arr, sigma_arr, start_arr, len(idx))
+    scenarios["trend_down"] = pd.DataFrame(panel, index=idx, columns=universe)
 
     # 3) mean_revert
     if verbose: print("[zoo] generating mean_revert")
     mean_rev = {}
+    rngs = _spawn_rngs(seed_seqs["mean_revert"], len(universe))
     for i, sym in enumerate(universe):
-        mu = np.log(start_prices[sym])  # mean log-price
+        mu = np.log(start_arr[i])  # mean log-price
         sigma = 0.06
         theta = 1.2  # stronger pull
-        mean_rev[sym] = _mean_reverting_prices(seed + 200 + i, mu, sigma, theta, start_prices[sym], idx)
+        mean_rev[sym] = _mean_reverting_prices(rngs[i], mu, sigma, theta, start_arr[i], idx)
     scenarios["mean_revert"] = pd.DataFrame(mean_rev)
 
     # 4) regime_switch (cheeky rhino)
@@ -169,33 +216,31 @@ def generate_stress_zoo(
         [0.10, 0.10, 0.80],
     ])
     rs = {}
+    rngs = _spawn_rngs(seed_seqs["regime_switch"], len(universe))
     for i, sym in enumerate(universe):
-        rs[sym] = _regime_switch_prices(seed + 400 + i, regimes, trans_mat, start_prices[sym], idx)
+        rs[sym] = _regime_switch_prices(rngs[i], regimes, trans_mat, start_arr[i], idx)
     scenarios["regime_switch"] = pd.DataFrame(rs)
 
     # 5) vol_spike (sudden volatility; short spikes)
     if verbose: print("[zoo] generating vol_spike")
-    vs = {}
-    for i, sym in enumerate(universe):
-        base_mu, base_sigma = 0.02, 0.10
-        # create base series and then inject a few spike windows
-        p = _gbm_prices(seed + 500 + i, base_mu, base_sigma, start_prices[sym], idx).copy()
-        rng_local = np.random.default_rng(seed + 600 + i)
-        for spike_start in rng_local.choice(range(30, len(idx)-30), size=5, replace=False):
-            span = rng_local.integers(3, 15)
+    base_mu, base_sigma = 0.02, 0.10
+    rng = _scenario_rng(seed_seqs["vol_spike"])
+    # create base panel and then inject a few spike windows per symbol
+    panel = _gbm_panel(rng, np.full(len(universe), base_mu), np.full(len(universe), base_sigma), start_arr, len(idx))
+    for i in range(len(universe)):
+        arr = panel[:, i]
+        for spike_start in rng.choice(range(30, len(idx)-30), size=5, replace=False):
+            span = rng.integers(3, 15)
             jdx = slice(spike_start, spike_start+span)
             # multiply local volatility by factor
-            window = _gbm_prices(seed + 700 + i + spike_start, 0.0, base_sigma*3.5, p.iloc[jdx].iloc[0], idx[jdx])
-            p.iloc[jdx] = window.values
-        vs[sym] = p
-    scenarios["vol_spike"] = pd.DataFrame(vs)
+            arr[jdx] = _gbm_values(rng, 0.0, base_sigma*3.5, arr[spike_start], len(arr[jdx]))
+    scenarios["vol_spike"] = pd.DataFrame(panel, index=idx, columns=universe)
 
     # 6) jumps (black rhino)
     if verbose: print("[zoo] generating jumps")
-    jumps = {}
-    for i, sym in enumerate(universe):
-        jumps[sym] = _jumps_prices(seed + 800 + i, mu=0.02, sigma=0.1, jump_prob=0.01, jump_mu=-0.05, jump_sigma=0.08, start_price=start_prices[sym], idx=idx)
-    scenarios["jumps"] = pd.DataFrame(jumps)
+    panel = _jumps_panel(_scenario_rng(seed_seqs["jumps"]), mu=0.02, sigma=0.1, jump_prob=0.01,
+                         jump_mu=-0.05, jump_sigma=0.08, start_arr=start_arr, n=len(idx))
+    scenarios["jumps"] = pd.DataFrame(panel, index=idx, columns=universe)
 
     # 7) diversification_failure: many assets highly correlated (everything moves together)
     if verbose: print("[zoo] generating diversification_failure")
@@ -206,24 +251,24 @@ def generate_stress_zoo(
     # correlation near 0.95
     corr = np.full((k, k), 0.95)
     np.fill_diagonal(corr, 1.0)
-    basket = _correlated_basket(seed + 1000, mus, sigs, corr, [start_prices[s] for s in universe], idx)
+    rng = _scenario_rng(seed_seqs["diversification_failure"])
+    basket = _correlated_basket(rng, mus, sigs, corr, start_arr, idx)
     basket.columns = universe
     scenarios["diversification_failure"] = basket
 
     # 8) black_swan: long calm then single catastrophic month
     if verbose: print("[zoo] generating black_swan")
-    bs = {}
-    for i, sym in enumerate(universe):
-        p = _gbm_prices(seed + 1200 + i, mu=0.06, sigma=0.08, start_price=start_prices[sym], idx=idx).copy()
+    rng = _scenario_rng(seed_seqs["black_swan"])
+    panel = _gbm_panel(rng, np.full(len(universe), 0.06), np.full(len(universe), 0.08), start_arr, len(idx))
+    for i in range(len(universe)):
+        arr = panel[:, i]
         # pick one month to crash
-        rng_local = np.random.default_rng(seed + 1300 + i)
-        crash_start = rng_local.integers(low=100, high=len(idx)-20)
-        crash_len = rng_local.integers(5, 15)
+        crash_start = rng.integers(low=100, high=len(idx)-20)
+        crash_len = rng.integers(5, 15)
         # mul by a steep drop path
         drop = np.linspace(1.0, 0.45 - 0.1*(i%3), crash_len)
-        p.iloc[crash_start:crash_start+crash_len] = p.iloc[crash_start] * drop
-        bs[sym] = p
-    scenarios["black_swan"] = pd.DataFrame(bs)
+        arr[crash_start:crash_start+crash_len] = arr[crash_start] * drop
+    scenarios["black_swan"] = pd.DataFrame(panel, index=idx, columns=universe)
 
     # Write outputs
     meta = {}
@@ -235,9 +280,7 @@ def generate_stress_zoo(
             s = pd.DataFrame({"Date": df.index, "Close": df[col].values})
             s.to_csv(scen_dir / f"{col}.csv", index=False)
         # combined prices csv
-        df_out = df.copy()
-        df_out.index.name = "Date"
-        df_out.to_csv(scen_dir / "prices.csv")
+        _write_prices_csv(df, scen_dir / "prices.csv")
         meta[scen] = {"path": str(scen_dir), "shape": df.shape}
         if verbose: print(f"[zoo] wrote scenario {scen} -> {scen_dir}  shape={df.shape}")
 
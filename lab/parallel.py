@@ -0,0 +1,15 @@
+"""Process pools for running independent backtests side by side."""
+from __future__ import annotations
+
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+
+
+def process_pool(max_workers: int, **kwargs) -> ProcessPoolExecutor:
+    """
+    ProcessPoolExecutor with spawned rather than forked workers; *kwargs* go to the executor.
+
+    Forked children can deadlock once numba's threading layer is loaded in the parent, so
+    every worker pool in the lab and its scripts is created here.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=mp.get_context("spawn"), **kwargs)
@@ -1,9 +1,14 @@
 from __future__ import annotations
-import os, yaml, numpy as np, pandas as pd, matplotlib.pyplot as plt
+import hashlib, json, os, sys, numpy as np, pandas as pd
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
 
-from strategies.etrp import run_etrp
+# single import path for the strategy package, also when run as `python lab/run.py`
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+from lab.strategies.etrp import run_etrp
 # NEW: stress zoo hook
 try:
     from lab.data.stress_zoo import generate_stress_zoo
@@ -13,13 +18,135 @@ except Exception:
 
 # ---------------- utilities
 
+_CACHE_KEY = b"lab.cache_key"
+
+def _source_key(source: Path) -> str:
+    """
+    Size and nanosecond mtime of *source*; copies that keep old mtimes still change one of them.
+    """
+    st = source.stat()
+    return f"{st.st_size}:{st.st_mtime_ns}"
+
+def _read_parquet_cache(cache: Path, key: str) -> pd.DataFrame | None:
+    """
+    Return the cached frame if it exists and was written for exactly *key*.
+    """
+    try:
+        if cache.exists():
+            import pyarrow.parquet as pq
+            meta = pq.read_schema(cache).metadata or {}
+            if meta.get(_CACHE_KEY) == key.encode():
+                return pd.read_parquet(cache)
+    except Exception as exc:
+        # missing pyarrow or a corrupt cache: fall back to the CSV
+        print(f"[run] warning: ignoring parquet cache {cache}: {exc}")
+    return None
+
+def _write_parquet_cache(df: pd.DataFrame, cache: Path, key: str) -> None:
+    """
+    Best-effort write of a parsed frame, tagged with *key* in the parquet metadata.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        tbl = pa.Table.from_pandas(df)
+        tbl = tbl.replace_schema_metadata({**(tbl.schema.metadata or {}), _CACHE_KEY: key.encode()})
+        pq.write_table(tbl, cache, compression="zstd")
+    except Exception:
+        # cache is an optimisation only (pyarrow optional / read-only data dir)
+        pass
+
+def with_overrides(cfg: dict, section: str, **overrides) -> dict:
+    """
+    Shallow copy of *cfg* with keys replaced in one sub-dict; the other sections stay shared.
+    """
+    new = dict(cfg)
+    new[section] = {**cfg.get(section, {}), **overrides}
+    return new
+
+def price_sources(cfg: dict) -> list[Path]:
+    """
+    CSV files that load_prices(cfg) reads (empty when it falls back to synthetic data).
+    """
+    data_dir = _resolve_data_dir(cfg)
+    return sorted(data_dir.glob("*.csv")) if data_dir.exists() else []
+
+def load_price_snapshot(cache: Path, cfg: dict, load) -> pd.DataFrame:
+    """
+    Reuse a parquet snapshot of load(), a loader for *cfg*'s prices, while the snapshot was
+    written for the same data_dir, universe, dates and seed and the price CSVs are unchanged;
+    otherwise call *load()* and refresh the snapshot.
+    """
+    data = cfg.get("data", {})
+    backtest = cfg.get("backtest", {})
+    ident = {
+        "data_dir": str(_resolve_data_dir(cfg).resolve()),
+        "universe": list(data.get("universe", [])),
+        "start": str(backtest.get("start")),
+        "end": str(backtest.get("end")),
+        "seed": cfg.get("seed", 42),
+        "use_synth_if_missing": data.get("use_synth_if_missing", True),
+        "sources": {str(p): _source_key(p) for p in price_sources(cfg)},
+    }
+    key = hashlib.sha256(json.dumps(ident, sort_keys=True, default=str).encode()).hexdigest()
+    px = _read_parquet_cache(cache, key)
+    if px is not None:
+        return px
+    px = load()
+    cache.parent.mkdir(parents=True, exist_ok=True)
+    _write_parquet_cache(px, cache, key)
+    return px
+
+def _read_combined_csv(path: Path) -> pd.DataFrame:
+    """
+    Parse a wide prices.csv with Arrow's multithreaded reader, falling back to pandas.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pac
+    except ImportError:
+        return pd.read_csv(path, parse_dates=["Date"]).set_index("Date")
+    try:
+        tbl = pac.read_csv(
+            path,
+            convert_options=pac.ConvertOptions(
+                column_types={"Date": pa.timestamp("ns")},
+                timestamp_parsers=["%Y-%m-%d", pac.ISO8601],
+            ),
+        )
+    except pa.ArrowInvalid:
+        # date layouts Arrow does not know: let pandas infer them as before
+        return pd.read_csv(path, parse_dates=["Date"]).set_index("Date")
+    return tbl.to_pandas(self_destruct=True).set_index("Date")
+
+def _join_columns(series: list[pd.Series]) -> pd.DataFrame:
+    """
+    Outer-join named Series column-wise into one pre-allocated array.
+    """
+    idx = series[0].index
+    if all(s.index.equals(idx) for s in series[1:]):
+        # fast path: shared calendar, no alignment needed
+        arr = np.column_stack([s.to_numpy(dtype=float) for s in series])
+    else:
+        for s in series[1:]:
+            idx = idx.union(s.index)
+        arr = np.full((len(idx), len(series)), np.nan)
+        for i, s in enumerate(series):
+            arr[idx.get_indexer(s.index), i] = s.to_numpy(dtype=float)
+    return pd.DataFrame(arr, index=idx, columns=[s.name for s in series])
+
 def _read_prices_from_folder(folder: Path, universe: list[str]) -> pd.DataFrame:
     """
     Load prices from either per-symbol CSVs (Date, Close) or a combined prices.csv (wide).
     """
     combined = folder / "prices.csv"
     if combined.exists():
-        df = pd.read_csv(combined, parse_dates=["Date"]).set_index("Date")
+        cache = folder / "prices.parquet"
+        key = _source_key(combined)
+        df = _read_parquet_cache(cache, key)
+        if df is None:
+            df = _read_combined_csv(combined)
+            _write_parquet_cache(df, cache, key)
         cols = [c for c in universe if c in df.columns]
         if not cols:
             raise ValueError(f"No requested symbols found in combined file: {combined}")
@@ -35,7 +162,7 @@ def _read_prices_from_folder(folder: Path, universe: list[str]) -> pd.DataFrame:
             frames.append(None)
     if all(s is None for s in frames):
         raise FileNotFoundError(f"No CSVs found for requested tickers in {folder}")
-    return pd.concat([s for s in frames if s is not None], axis=1)
+    return _join_columns([s for s in frames if s is not None])
 
 def _resolve_data_dir(cfg: dict) -> Path:
     """
@@ -68,6 +195,39 @@ def _resolve_data_dir(cfg: dict) -> Path:
     # regular path
     return Path(str(data_dir_spec))
 
+def plot_equity_curve(equity: pd.Series, path: Path) -> None:
+    """
+    Render the equity curve to PNG. matplotlib is imported lazily so runs
+    that leave ``output.plot`` off never pay for it.
+    """
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots(figsize=(9,4))
+    equity.plot(ax=ax, title="ETRP – Equity Curve")
+    ax.grid(True, alpha=.3)
+    fig.tight_layout()
+    fig.savefig(path, dpi=150)
+    plt.close(fig)
+
+@lru_cache(maxsize=8)
+def _synthetic_prices(universe: tuple[str, ...], start: pd.Timestamp, end: pd.Timestamp, seed: int) -> pd.DataFrame:
+    """
+    GBM-ish stand-in prices, memoised: the draw is fully determined by the arguments.
+    Callers get a slice of the cached frame (load_prices copies via dropna), never the frame itself.
+    """
+    np.random.seed(seed)
+    # business days in [start, end] from numpy's busday kernel (same dates as date_range(freq="B"))
+    first, stop = start.to_datetime64().astype("datetime64[D]"), (end + pd.Timedelta(days=1)).date()
+    n_days = int(np.busday_count(first, stop))
+    idx = pd.DatetimeIndex(np.busday_offset(first, np.arange(n_days), roll="forward").astype("datetime64[ns]"))
+    synth = {}
+    for i, sym in enumerate(universe):
+        mu, sig = 0.06, 0.18
+        eps = np.random.normal(0, sig/np.sqrt(252), size=len(idx))
+        r = (mu/252) + eps
+        synth[sym] = 100 * (1 + pd.Series(r, index=idx)).cumprod()
+    return pd.DataFrame(synth)
+
 def load_prices(cfg: dict) -> pd.DataFrame:
     universe = list(cfg["data"]["universe"])
     start = pd.Timestamp(cfg["backtest"]["start"])
@@ -81,31 +241,47 @@ def load_prices(cfg: dict) -> pd.DataFrame:
         # same behavior as before
         if cfg["data"].get("use_synth_if_missing", True):
             print(f"[run] data_dir '{data_dir}' missing; using synthetic GBM-ish data.")
-            np.random.seed(cfg.get("seed", 42))
-            idx = pd.date_range(start, end, freq="B")
-            synth = {}
-            for i, sym in enumerate(universe):
-                mu, sig = 0.06, 0.18
-                eps = np.random.normal(0, sig/np.sqrt(252), size=len(idx))
-                r = (mu/252) + eps
-                synth[sym] = 100 * (1 + pd.Series(r, index=idx)).cumprod()
-            px = pd.DataFrame(synth)
+            px = _synthetic_prices(tuple(universe), start, end, cfg.get("seed", 42))
         else:
             raise FileNotFoundError(f"Data dir not found: {data_dir}")
 
     px = px.loc[start:end].dropna(how="all")
     return px
 
+def _adaptive_state_paths(cfg: dict) -> tuple[str, str | None]:
+    """
+    (JSON learner-state file, legacy pickle to fall back on) for the adaptive loop.
+    A .pkl state_path from older configs is still read, but the state is rewritten as JSON next to it.
+    """
+    path = cfg.get("adaptive", {}).get("persistence", {}).get("state_path", "runs/adaptive_state.learner.json")
+    if path.endswith((".pkl", ".pickle")):
+        return str(Path(path).with_suffix(".learner.json")), path
+    return path, None
+
+def _load_adaptive_state(cfg: dict):
+    """
+    Persisted OnlineLearnerState, preferring the JSON file over a legacy pickle; None if neither exists.
+    """
+    from lab.adaptive.persistence import load_state
+
+    for path in _adaptive_state_paths(cfg):
+        if path and os.path.exists(path):
+            return load_state(path)
+    return None
+
 def main(config_path: str = "configs/etrp.yml"):
+    import yaml
+
     with open(config_path, "r") as f:
         cfg = yaml.safe_load(f)
 
+    # lab.adaptive.* is only imported when the adaptive loop is switched on
+    adaptive_enabled = bool(cfg.get("adaptive", {}).get("enabled", False))
+
     # optional: overwrite strategy target_vol_ann from persisted learner state
-    try:
-        from lab.adaptive.persistence import load_pickle
-        st_path = cfg.get("adaptive", {}).get("persistence", {}).get("state_path", "")
-        if st_path and os.path.exists(st_path):
-            state = load_pickle(st_path)
+    if adaptive_enabled:
+        try:
+            state = _load_adaptive_state(cfg)
             if hasattr(state, "params"):
                 cfg["strategy"]["target_vol_ann"] = float(
                     state.params.get("vol_target", cfg["strategy"]["target_vol_ann"])
@@ -113,8 +289,8 @@ def main(config_path: str = "configs/etrp.yml"):
                 print(
                     f"[adaptive] using persisted vol_target={cfg['strategy']['target_vol_ann']:.3f}"
                 )
-    except Exception as exc:
-        print(f"[adaptive] warning: failed to apply persisted params: {exc}")
+        except Exception as exc:
+            print(f"[adaptive] warning: failed to apply persisted params: {exc}")
 
     outdir = Path(cfg["output"]["out_dir"]) / datetime.now().strftime("%Y%m%d-%H%M%S")
     outdir.mkdir(parents=True, exist_ok=True)
@@ -123,15 +299,15 @@ def main(config_path: str = "configs/etrp.yml"):
     res = run_etrp(px, cfg)
 
     # --- adaptive integration with persistence ---
-    if cfg.get("adaptive", {}).get("enabled", False):
+    if adaptive_enabled:
         from lab.adaptive.online_learner import OnlineLearner, OnlineLearnerState
         from lab.adaptive.regime_classifier import classify_regime
         from lab.adaptive.vol_targeter import compute_target_scalar
-        from lab.adaptive.persistence import save_pickle, load_pickle, save_json
+        from lab.adaptive.persistence import save_json, save_state_json
 
         adaptive_cfg = cfg["adaptive"]
         persistence_cfg = adaptive_cfg.get("persistence", {})
-        state_path = persistence_cfg.get("state_path", "runs/adaptive_state.pkl")
+        state_path, _ = _adaptive_state_paths(cfg)
         snapshot_json = persistence_cfg.get("snapshot_json", "runs/adaptive_state.json")
         keep_json = bool(persistence_cfg.get("keep_json", True))
 
@@ -153,16 +329,17 @@ def main(config_path: str = "configs/etrp.yml"):
             bounds=bounds,
         )
 
-        if os.path.exists(state_path):
-            try:
-                state = load_pickle(state_path)
-                print(f"[adaptive] loaded state from {state_path}: {state.params}")
-            except Exception as exc:
-                print(f"[adaptive] failed to load state ({exc}); using fresh state.")
-                state = init_state
-        else:
+        try:
+            state = _load_adaptive_state(cfg)
+        except Exception as exc:
+            print(f"[adaptive] failed to load state ({exc}); using fresh state.")
             state = init_state
-            print("[adaptive] no prior state; starting fresh.")
+        else:
+            if state is None:
+                state = init_state
+                print("[adaptive] no prior state; starting fresh.")
+            else:
+                print(f"[adaptive] loaded state: {state.params}")
 
         learner = OnlineLearner(state)
 
@@ -192,7 +369,7 @@ def main(config_path: str = "configs/etrp.yml"):
         )
         print(f"[adaptive] exposure scalar (next run hint): {scalar:.3f}")
 
-        save_pickle(state_path, learner.state)
+        save_state_json(state_path, learner.state)
         if keep_json:
             try:
                 save_json(
@@ -214,12 +391,9 @@ def main(config_path: str = "configs/etrp.yml"):
     m = res["metrics"]
     print(f"[metrics] CAGR={m['CAGR']:.2%}  VolAnn={m['VolAnn']:.2%}  Sharpe={m['Sharpe']:.2f}  MaxDD={m['MaxDD']:.2%}")
 
-    if cfg["output"].get("plot", True):
-        fig, ax = plt.subplots(figsize=(9,4))
-        res["equity"].plot(ax=ax, title="ETRP – Equity Curve")
-        ax.grid(True, alpha=.3)
-        fig.tight_layout()
-        fig.savefig(outdir / "equity.png", dpi=150)
+    # equity.csv above is always written; the PNG is opt-in
+    if cfg["output"].get("plot", False):
+        plot_equity_curve(res["equity"], outdir / "equity.png")
 
 if __name__ == "__main__":
     main()
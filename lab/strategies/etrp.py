@@ -2,28 +2,215 @@
 
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Dict, Optional
 
 import numpy as np
 import pandas as pd
 
-
-def _shannon_entropy(values: np.ndarray, bins: int = 20) -> float:
-    """Approximate Shannon entropy (base e) using histogram density."""
-    if values.size == 0 or np.all(np.isnan(values)):
-        return float("nan")
-    hist, _ = np.histogram(values[~np.isnan(values)], bins=bins, density=True)
-    total = hist.sum()
-    if total == 0:
-        return float("nan")
-    probs = hist / total
-    probs = probs[probs > 0]
-    return float(-np.sum(probs * np.log(probs)))
+try:  # numba is optional; without it the NumPy kernels below are used
+    from numba import njit, prange, types as nbt
+except ImportError:  # pragma: no cover - exercised only without numba
+    njit = prange = nbt = None
+
+_NUMBA_ENGINE_KWARGS = {"nopython": True, "nogil": True, "parallel": False}
+
+
+def _plogp_table(window: int) -> np.ndarray:
+    """``-(k/W) log(k/W)`` for every possible bin count ``k`` of a full window."""
+    probs = np.arange(window + 1) / window
+    table = np.zeros(window + 1)
+    table[1:] = -probs[1:] * np.log(probs[1:])
+    return table
+
+
+if njit is not None:
+
+    # Explicit signatures compile eagerly at import and, with cache=True, load from
+    # the on-disk cache (``__pycache__`` or $NUMBA_CACHE_DIR) in later processes.
+    # Inputs are typed as read-only any-layout arrays: that accepts both the
+    # strided views from sliding_window_view and the buffers Rolling.apply passes.
+    _f8_1d_ro = nbt.Array(nbt.float64, 1, "A", readonly=True)
+    _f8_3d_ro = nbt.Array(nbt.float64, 3, "A", readonly=True)
+    _i8_1d_ro = nbt.Array(nbt.int64, 1, "A", readonly=True)
+
+    @njit(nbt.float64(_f8_1d_ro, nbt.int64, nbt.float64, nbt.float64, _f8_1d_ro), cache=True, nogil=True)
+    def _entropy_nb(values, nbins, vmin, vmax, plogp):
+        """Histogram entropy with ``np.histogram``'s equal-width binning; NaNs are skipped.
+
+        Full windows (``len(plogp) - 1`` valid samples) sum table lookups
+        instead of evaluating a log per bin.
+        """
+        counts = np.zeros(nbins, dtype=np.int64)
+        edges = np.linspace(vmin, vmax, nbins + 1)
+        span = vmax - vmin
+        n = 0
+        for x in values:
+            if np.isnan(x):
+                continue
+            k = 0
+            if span > 0:
+                k = int((x - vmin) * (nbins / span))
+                if k >= nbins:
+                    k = nbins - 1
+                # same +-1 ULP edge correction as np.histogram
+                if x < edges[k]:
+                    k -= 1
+                elif k < nbins - 1 and x >= edges[k + 1]:
+                    k += 1
+            counts[k] += 1
+            n += 1
+        if n == 0:
+            return np.nan
+        h = 0.0
+        if n == plogp.shape[0] - 1:
+            for c in counts:
+                h += plogp[c]
+            return h
+        for c in counts:
+            if c > 0:
+                p = c / n
+                h -= p * np.log(p)
+        return h
+
+    @lru_cache(maxsize=None)
+    def _entropy_kernel(bins: int, window: int):
+        """Rolling.apply kernel with *bins* and the p*log(p) table baked in as constants."""
+        plogp = _plogp_table(window)
+
+        @njit(nogil=True)
+        def _kern(values):
+            return _entropy_nb(values, bins, np.nanmin(values), np.nanmax(values), plogp)
+
+        return _kern
+
+    @njit(nbt.void(_f8_3d_ro, nbt.int64, _f8_1d_ro, nbt.float64[:, :]), parallel=True, cache=True)
+    def _entropy_grid(swv, nbins, plogp, out):
+        """Entropy of every (date, asset) window in a ``(T', N, W)`` sliding-window view."""
+        for i in prange(swv.shape[0]):
+            for j in range(swv.shape[1]):
+                w = swv[i, j]
+                if not np.isfinite(w).all():
+                    # incomplete window (rolling() treats ±inf as NaN too), as with min_periods=window
+                    out[i, j] = np.nan
+                else:
+                    out[i, j] = _entropy_nb(w, nbins, w.min(), w.max(), plogp)
+
+
+def _rolling_entropy_np(values: np.ndarray, window: int, bins: int) -> np.ndarray:
+    """Histogram entropy of every full window at once (NumPy path when numba is missing).
+
+    Each window is binned over its own min/max with ``np.histogram``'s
+    equal-width rule, including its edge correction; windows holding a NaN
+    or ±inf give NaN.
+    """
+    out = np.full(len(values), np.nan)
+    if len(values) < window:
+        return out
+    sw = np.lib.stride_tricks.sliding_window_view(values, window)
+    lo = sw.min(axis=1)
+    hi = sw.max(axis=1)
+    ok = np.isfinite(lo) & np.isfinite(hi)
+    sw, lo, hi = sw[ok], lo[ok], hi[ok]
+    flat = hi == lo
+    # np.histogram widens a zero range by 0.5 on each side
+    lo = np.where(flat, lo - 0.5, lo)
+    hi = np.where(flat, hi + 0.5, hi)
+    edges = np.linspace(lo, hi, bins + 1, axis=1)
+    rows = np.arange(len(sw))[:, None]
+    k = ((sw - lo[:, None]) * (bins / (hi - lo))[:, None]).astype(np.int64)
+    np.minimum(k, bins - 1, out=k)
+    k -= sw < edges[rows, k]
+    k += (sw >= edges[rows, k + 1]) & (k != bins - 1)
+    counts = np.bincount((k + bins * rows).ravel(), minlength=len(sw) * bins).reshape(-1, bins)
+    out[window - 1:][ok] = _plogp_table(window)[counts].sum(axis=1)
+    return out
 
 
 def rolling_entropy(returns: pd.Series, window: int, bins: int) -> pd.Series:
     """Rolling entropy for a return series."""
-    return returns.rolling(window).apply(lambda window_vals: _shannon_entropy(window_vals.values, bins))
+    if njit is None:
+        out = _rolling_entropy_np(returns.to_numpy(dtype=np.float64), window, bins)
+        return pd.Series(out, index=returns.index, name=returns.name)
+    # full windows only (min_periods == window), so the kernel never sees NaNs
+    rolling = returns.rolling(window)
+    return rolling.apply(_entropy_kernel(bins, window), raw=True, engine="numba", engine_kwargs=_NUMBA_ENGINE_KWARGS)
+
+
+def rolling_entropy_frame(returns: pd.DataFrame, window: int, bins: int) -> pd.DataFrame:
+    """Rolling entropy for every column of a return frame in one pass."""
+    if njit is None:
+        return returns.apply(lambda col: rolling_entropy(col, window, bins))
+    values = returns.to_numpy(dtype=np.float64)
+    out = np.full(values.shape, np.nan)
+    if len(values) >= window:
+        swv = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)
+        _entropy_grid(swv, bins, _plogp_table(window), out[window - 1:])
+    return pd.DataFrame(out, index=returns.index, columns=returns.columns)
+
+
+def _sliding_entropy_codes(codes: np.ndarray, window: int, nbins: int) -> np.ndarray:
+    """Entropy of each full window over pre-binned codes (-1 marks NaN/inf), O(1) per step.
+
+    Keeps per-bin counts ``n_i`` and ``S = sum(n_i log n_i)``; adding or
+    dropping one sample changes a single ``n_i`` so ``S`` is patched in place
+    and ``H = log(n) - S / n``.
+    """
+    nlogn = np.zeros(window + 1)
+    for k in range(2, window + 1):
+        nlogn[k] = k * np.log(k)
+    out = np.full(codes.shape[0], np.nan)
+    counts = np.zeros(nbins, dtype=np.int64)
+    s = 0.0
+    n = 0
+    n_nan = 0
+    for t in range(codes.shape[0]):
+        c = codes[t]
+        if c < 0:
+            n_nan += 1
+        else:
+            s += nlogn[counts[c] + 1] - nlogn[counts[c]]
+            counts[c] += 1
+            n += 1
+        if t >= window:
+            c = codes[t - window]
+            if c < 0:
+                n_nan -= 1
+            else:
+                s += nlogn[counts[c] - 1] - nlogn[counts[c]]
+                counts[c] -= 1
+                n -= 1
+        if t >= window - 1 and n_nan == 0:
+            out[t] = np.log(n) - s / n
+    return out
+
+
+if njit is not None:
+    _sliding_entropy_codes = njit(nbt.float64[:](_i8_1d_ro, nbt.int64, nbt.int64), cache=True, nogil=True)(
+        _sliding_entropy_codes
+    )
+
+
+def rolling_entropy_incremental(
+    returns: pd.Series, window: int, bins: int, edges: Optional[np.ndarray] = None
+) -> pd.Series:
+    """Rolling entropy over fixed bin edges, updated incrementally per step.
+
+    Unlike :func:`rolling_entropy`, bins do not move with each window's
+    min/max, which is what makes the O(1) add/drop update possible. By
+    default the edges are the series' ``bins``-quantiles over the whole
+    sample, so pass *edges* explicitly when look-ahead matters.
+    """
+    values = returns.to_numpy(dtype=np.float64)
+    if edges is None:
+        finite = values[np.isfinite(values)]
+        if finite.size == 0:
+            return pd.Series(np.nan, index=returns.index, name=returns.name)
+        edges = np.quantile(finite, np.linspace(0.0, 1.0, bins + 1))
+    codes = np.searchsorted(np.asarray(edges)[1:-1], values, side="right").astype(np.int64)
+    codes[~np.isfinite(values)] = -1
+    out = _sliding_entropy_codes(codes, window, len(edges) - 1)
+    return pd.Series(out, index=returns.index, name=returns.name)
 
 
 def realized_vol(returns: pd.Series, window: int) -> pd.Series:
@@ -31,44 +218,120 @@ def realized_vol(returns: pd.Series, window: int) -> pd.Series:
     return returns.rolling(window).std()
 
 
-def to_month_end_index(df: pd.DataFrame) -> pd.DatetimeIndex:
-    """Map a daily index to month-end timestamps."""
-    return df.index.to_period("M").to_timestamp("M")
+def _rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+    """Column-wise rolling sample std (ddof=1) from cumulative sums.
+
+    Matches ``DataFrame.rolling(window).std()``: NaN until a full window of
+    finite values is available (±inf counts as missing, as in pandas). Columns are centred first to keep the
+    cumulative sums small.
+    """
+    valid = np.isfinite(x)
+    counts = valid.sum(axis=0)
+    xc = np.where(valid, x, 0.0)
+    xc -= xc.sum(axis=0) / np.maximum(counts, 1)
+    xc[~valid] = 0.0
+    pad = np.zeros((1, x.shape[1]))
+    cs1 = np.concatenate([pad, np.cumsum(xc, axis=0)])
+    cs2 = np.concatenate([pad, np.cumsum(xc * xc, axis=0)])
+    cnt = np.concatenate([pad, np.cumsum(valid, axis=0)])
+    out = np.full(x.shape, np.nan)
+    if len(x) < window:
+        return out
+    s1 = cs1[window:] - cs1[:-window]
+    ss = cs2[window:] - cs2[:-window] - s1 * s1 / window
+    # anything below the running sums' rounding noise is a flat window
+    ss[ss <= 1e3 * np.finfo(np.float64).eps * cs2[window:]] = 0.0
+    std = np.sqrt(ss / (window - 1))
+    std[cnt[window:] - cnt[:-window] < window] = np.nan
+    out[window - 1:] = std
+    return out
+
+
+def _month_end(obj, how: str):
+    """Per-month ``resample("ME")`` aggregate, keeping only the months that have rows.
+
+    Resampling also emits empty calendar months (NaN for ``last``, 0 for
+    ``sum``); a gap in the data must not become a zero-return month.
+    """
+    resampler = obj.resample("ME")
+    out = getattr(resampler, how)()
+    return out[resampler.size().to_numpy() > 0]
 
 
 def inverse_vol_weights(ret_df: pd.DataFrame, window: int) -> pd.DataFrame:
     """Compute inverse-volatility weights."""
-    vol = ret_df.rolling(window).std()
+    vol = pd.DataFrame(
+        _rolling_std(ret_df.to_numpy(dtype=np.float64), window),
+        index=ret_df.index,
+        columns=ret_df.columns,
+    )
     weights = 1.0 / vol.replace(0, np.nan)
     weights = weights.div(weights.sum(axis=1), axis=0)
     return weights
 
 
-def cap_and_renorm(weights: pd.DataFrame, cap: float) -> pd.DataFrame:
-    """Apply a per-asset cap and renormalize weights to sum to 1."""
-    capped = weights.clip(upper=cap)
-    totals = capped.sum(axis=1).replace(0, np.nan)
-    return capped.div(totals, axis=0)
+def _row_totals(w: np.ndarray) -> np.ndarray:
+    """NaN-skipping row sums as a column vector, with zero totals mapped to NaN."""
+    totals = np.nansum(w, axis=1, keepdims=True)
+    totals[totals == 0] = np.nan
+    return totals
+
+
+def _row_nanmean(values: np.ndarray) -> np.ndarray:
+    """Row means skipping NaNs; all-NaN rows give NaN (like ``DataFrame.mean(axis=1)``)."""
+    valid = ~np.isnan(values)
+    counts = valid.sum(axis=1)
+    sums = np.where(valid, values, 0.0).sum(axis=1)
+    out = np.full(len(values), np.nan)
+    np.divide(sums, counts, out=out, where=counts > 0)
+    return out
+
+
+def _tilt_cap_renorm(base: np.ndarray, entropy_norm: np.ndarray, cap: float) -> np.ndarray:
+    """Entropy tilt, normalize, cap and renormalize in one buffer.
+
+    Weights ``base * (1 - entropy_norm)`` are scaled to sum to 1, clipped at
+    *cap* and scaled to sum to 1 again; NaNs are skipped in row sums and
+    all-zero rows become NaN.
+    """
+    w = 1.0 - entropy_norm
+    w *= base
+    w /= _row_totals(w)
+    np.minimum(w, cap, out=w)
+    w /= _row_totals(w)
+    return w
 
 
 def normalize_01(series: pd.Series, lookback: int) -> pd.Series:
     """Normalize a series to the [0, 1] range using a rolling min/max."""
-    rolling_min = series.rolling(lookback).min()
-    rolling_max = series.rolling(lookback).max()
-    denom = (rolling_max - rolling_min).replace(0, np.nan)
-    return (series - rolling_min) / denom
+    rolling = series.rolling(lookback)
+    rolling_min = rolling.min().to_numpy()
+    denom = rolling.max().to_numpy() - rolling_min
+    denom[denom == 0] = np.nan
+    out = series.to_numpy(dtype=np.float64) - rolling_min
+    out /= denom
+    return pd.Series(out, index=series.index, name=series.name)
 
 
 def target_vol_scalar(portfolio_returns: pd.Series, target_vol_ann: float) -> float:
     """Compute a leverage scalar to hit the target annualized volatility."""
     if len(portfolio_returns) < 252:
         return 1.0
-    vol_ann = portfolio_returns[-252:].std() * np.sqrt(252)
-    if pd.isna(vol_ann) or vol_ann == 0:
+    tail = np.asarray(portfolio_returns, dtype=np.float64)[-252:]
+    tail = tail[~np.isnan(tail)]  # skip NaNs like Series.std
+    if tail.size < 2:
+        return 1.0
+    vol_ann = float(np.std(tail, ddof=1) * np.sqrt(252))
+    if np.isnan(vol_ann) or vol_ann == 0:
         return 1.0
     return float(np.clip(target_vol_ann / vol_ann, 0.2, 5.0))
 
 
+def _prep_returns(prices: pd.DataFrame) -> pd.DataFrame:
+    """Daily simple returns of a (date-sorted) price frame."""
+    return prices.sort_index().pct_change().dropna(how="all")
+
+
 def etrp_weights(
     prices: pd.DataFrame,
     window_days: int = 63,
@@ -76,22 +339,54 @@ def etrp_weights(
     weight_cap: float = 0.30,
     target_vol_ann: float = 0.10,
     regime: Optional[Dict] = None,
+    entropy_method: str = "histogram",
 ) -> pd.DataFrame:
-    """Compute monthly weights for the Entropy-Tilted Risk Parity strategy."""
-    prices = prices.sort_index()
-    returns = prices.pct_change().dropna(how="all")
+    """Compute monthly weights for the Entropy-Tilted Risk Parity strategy.
+
+    ``entropy_method="incremental"`` swaps the per-window histogram for
+    :func:`rolling_entropy_incremental` (fixed quantile bins, O(1) per step).
+    """
+    return etrp_weights_from_returns(
+        _prep_returns(prices),
+        window_days=window_days,
+        entropy_bins=entropy_bins,
+        weight_cap=weight_cap,
+        target_vol_ann=target_vol_ann,
+        regime=regime,
+        entropy_method=entropy_method,
+    )
+
 
+def etrp_weights_from_returns(
+    returns: pd.DataFrame,
+    window_days: int = 63,
+    entropy_bins: int = 20,
+    weight_cap: float = 0.30,
+    target_vol_ann: float = 0.10,
+    regime: Optional[Dict] = None,
+    entropy_method: str = "histogram",
+) -> pd.DataFrame:
+    """Same as :func:`etrp_weights` for an already computed daily return frame."""
     base_weights = inverse_vol_weights(returns, window_days)
 
-    entropy = returns.apply(lambda col: rolling_entropy(col, window_days, entropy_bins))
+    if entropy_method == "incremental":
+        entropy = returns.apply(lambda col: rolling_entropy_incremental(col, window_days, entropy_bins))
+    elif entropy_method == "histogram":
+        entropy = rolling_entropy_frame(returns, window_days, entropy_bins)
+    else:
+        raise ValueError(f"Unknown entropy_method: {entropy_method!r}")
     entropy_norm = entropy.apply(lambda col: normalize_01(col, 252 * 3))
+    entropy_norm_vals = entropy_norm.to_numpy()
+    # cross-asset mean for the regime filter, taken while the array is hot
+    avg_entropy_vals = _row_nanmean(entropy_norm_vals) if regime else None
+
+    tilted_daily = pd.DataFrame(
+        _tilt_cap_renorm(base_weights.to_numpy(), entropy_norm_vals, weight_cap),
+        index=base_weights.index,
+        columns=base_weights.columns,
+    )
 
-    tilted_daily = (base_weights * (1.0 - entropy_norm))
-    tilted_daily = tilted_daily.div(tilted_daily.sum(axis=1), axis=0)
-    tilted_daily = cap_and_renorm(tilted_daily, weight_cap)
-
-    month_ends = to_month_end_index(tilted_daily)
-    weights_me = tilted_daily.groupby(month_ends).last()
+    weights_me = _month_end(tilted_daily, "last")
     weights_me = weights_me.shift(1).dropna(how="all")
 
     if regime:
@@ -100,14 +395,19 @@ def etrp_weights(
         defense_weights = regime.get("defense_weights", {"IEF": 0.35, "TLT": 0.35, "SHY": 0.30})
 
         daily_weights = tilted_daily.shift(1).reindex(returns.index).fillna(0)
-        portfolio_daily = (daily_weights * returns).sum(axis=1)
+        ret_vals = returns.to_numpy()
+        if np.isnan(ret_vals).any():
+            ret_vals = np.where(np.isnan(ret_vals), 0.0, ret_vals)  # NaN-skipping like DataFrame.sum
+        portfolio_daily = pd.Series(
+            np.einsum("ti,ti->t", daily_weights.to_numpy(), ret_vals), index=returns.index
+        )
         portfolio_vol = portfolio_daily.rolling(window_days).std()
-        avg_entropy = entropy_norm.mean(axis=1)
+        avg_entropy = pd.Series(avg_entropy_vals, index=entropy_norm.index)
 
         vol_cutoff = portfolio_vol.rolling(252 * 3, min_periods=60).quantile(vol_threshold)
         entropy_cutoff = avg_entropy.rolling(252 * 3, min_periods=60).quantile(entropy_threshold)
         stress = (portfolio_vol > vol_cutoff) | (avg_entropy > entropy_cutoff)
-        stress_me = stress.groupby(month_ends).last()
+        stress_me = _month_end(stress, "last")
 
         defense = pd.Series(0.0, index=weights_me.columns)
         for symbol, weight in defense_weights.items():
@@ -129,32 +429,36 @@ def etrp_weights(
 
 def portfolio_returns_monthly(ret_daily: pd.DataFrame, weights_me: pd.DataFrame) -> pd.Series:
     """Expand monthly weights to daily returns and aggregate back to month-end."""
-    month_ends = ret_daily.index.to_period("M").to_timestamp("M")
     daily_weights = weights_me.reindex(ret_daily.index, method="ffill").fillna(0)
     portfolio_daily = (daily_weights.shift(1).fillna(0) * ret_daily).sum(axis=1)
-    return portfolio_daily.groupby(month_ends).apply(lambda values: (1 + values).prod() - 1)
+    # compound within each month as exp(sum(log1p(r))) - 1: a C-level groupby sum
+    return np.expm1(_month_end(np.log1p(portfolio_daily), "sum"))
 
 
 def run_etrp(prices: pd.DataFrame, config: Dict) -> Dict:
     """Run the ETRP pipeline and return weights, returns, equity curve, and metrics."""
     strategy_cfg = config["strategy"]
-    weights = etrp_weights(
-        prices=prices,
+    returns = _prep_returns(prices)
+    weights = etrp_weights_from_returns(
+        returns,
         window_days=strategy_cfg["window_days"],
         entropy_bins=strategy_cfg["entropy_bins"],
         weight_cap=strategy_cfg["weight_cap"],
         target_vol_ann=strategy_cfg["target_vol_ann"],
         regime=strategy_cfg.get("regime"),
+        entropy_method=strategy_cfg.get("entropy_method", "histogram"),
     )
 
-    returns = prices.pct_change().dropna(how="all")
     portfolio_monthly = portfolio_returns_monthly(returns, weights)
-    equity = (1 + portfolio_monthly).cumprod()
+    # compound in log space: sums of log1p stay accurate where long products drift
+    log_growth = np.log1p(portfolio_monthly.to_numpy()).cumsum()
+    equity_vals = np.exp(log_growth)
+    equity = pd.Series(equity_vals, index=portfolio_monthly.index, name=portfolio_monthly.name)
 
-    cagr = (1 + portfolio_monthly).prod() ** (12 / len(portfolio_monthly)) - 1
+    cagr = np.expm1(log_growth[-1] * 12 / len(log_growth))
     vol_ann = portfolio_monthly.std() * np.sqrt(12)
     sharpe = 0.0 if vol_ann == 0 else cagr / vol_ann
-    max_dd = (equity / equity.cummax() - 1).min()
+    max_dd = (equity_vals / np.maximum.accumulate(equity_vals) - 1).min()
 
     return {
         "weights_me": weights,
@@ -171,9 +475,12 @@ def run_etrp(prices: pd.DataFrame, config: Dict) -> Dict:
 
 __all__ = [
     "etrp_weights",
+    "etrp_weights_from_returns",
     "portfolio_returns_monthly",
     "realized_vol",
     "rolling_entropy",
+    "rolling_entropy_frame",
+    "rolling_entropy_incremental",
     "target_vol_scalar",
     "run_etrp",
 ]
@@ -10,8 +10,9 @@ from typing import Any
 import pandas as pd
 
 
-def sha256_text(text: str) -> str:
-    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+def sha256_text(text: str | bytes) -> str:
+    data = text if isinstance(text, bytes) else text.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
 
 
 def make_capsule(results_csv: str, sharpe_min: float, maxdd_max: float, out_prefix: str) -> bool:
@@ -15,8 +15,14 @@ if not os.path.exists(args.json):
     with open(args.json, "w") as f:
         json.dump({"runs": [{"id": "demo", "Sharpe": 1.23, "MaxDD": -0.18}]}, f, indent=2)
 
-blob = open(args.json, "rb").read()
-sha = hashlib.sha256(blob).hexdigest()
+with open(args.json, "rb") as f:
+    if hasattr(hashlib, "file_digest"):  # 3.11+: chunked reads, no full copy in memory
+        sha = hashlib.file_digest(f, "sha256").hexdigest()
+    else:
+        h = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            h.update(chunk)
+        sha = h.hexdigest()
 with open(args.sha, "w") as f:
     f.write(sha + "\n")
 
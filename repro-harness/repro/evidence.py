@@ -1,21 +1,68 @@
+import atexit
 import json
 import os
 import time
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; stdlib json produces the same lines
+    orjson = None
+
 ART_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "artifacts")
 EVID_PATH = os.path.join(ART_DIR, "evidence.jsonl")
+FLUSH_EVERY = 64
 
 
 def ensure_artifacts_dir() -> None:
     os.makedirs(ART_DIR, exist_ok=True)
 
 
+class _EvidenceSink:
+    """Append handle on EVID_PATH kept open for the whole run; flushed in batches and at exit."""
+
+    def __init__(self) -> None:
+        ensure_artifacts_dir()
+        self.f = open(EVID_PATH, "ab", buffering=1 << 16)
+        self.pending = 0
+        atexit.register(self.close)
+
+    def write(self, line: bytes) -> None:
+        self.f.write(line)
+        self.pending += 1
+        if self.pending >= FLUSH_EVERY:
+            self.flush()
+
+    def flush(self) -> None:
+        self.f.flush()
+        self.pending = 0
+
+    def close(self) -> None:
+        if not self.f.closed:
+            self.f.close()
+
+
+_sink: _EvidenceSink | None = None
+
+
+def _dumps(entry: dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(entry)
+    return json.dumps(entry, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
 def log_evidence(entry: dict[str, Any]) -> None:
-    ensure_artifacts_dir()
+    global _sink
+    if _sink is None:
+        _sink = _EvidenceSink()
     entry = {
         "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
         **entry,
     }
-    with open(EVID_PATH, "a", encoding="utf-8") as f:
-        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    _sink.write(_dumps(entry) + b"\n")
+
+
+def flush_evidence() -> None:
+    """Push buffered evidence lines to disk (e.g. before reading EVID_PATH back)."""
+    if _sink is not None:
+        _sink.flush()
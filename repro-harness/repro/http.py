@@ -1,12 +1,35 @@
 import time
+from http.cookiejar import DefaultCookiePolicy
+
 import requests
+from requests.adapters import HTTPAdapter
 from typing import Any
+from urllib3.util.retry import Retry
 
 
 def _now_ms() -> int:
     return int(time.time() * 1000)
 
 
+def _make_session() -> requests.Session:
+    # Reused across calls so back-to-back requests to a target share TCP/TLS connections.
+    # Retries cover connection-level failures only; HTTP status codes are returned as-is.
+    session = requests.Session()
+    # no cookie carry-over between calls: each request authenticates only via its own headers
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=32,
+        max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=()),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+_session = _make_session()
+
+
 def request_json(
     method: str,
     url: str,
@@ -14,7 +37,7 @@ def request_json(
     json_body: dict[str, Any] | None = None,
     timeout: int = 20,
 ) -> tuple[int, dict[str, Any] | None, str]:
-    r = requests.request(method, url, headers=headers, json=json_body, timeout=timeout)
+    r = _session.request(method, url, headers=headers, json=json_body, timeout=timeout)
     text = r.text[:4000]
     try:
         data = r.json()
@@ -18,7 +18,7 @@ python - <<'PY'
 import yaml, pandas as pd
 from pathlib import Path
 from lab.run import load_prices
-from strategies.etrp import run_etrp
+from lab.strategies.etrp import run_etrp
 from lab.adaptive.regime_classifier import classify_regime
 from lab.adaptive.vol_targeter import compute_target_scalar
 from lab.adaptive.watchdog import Watchdog, WatchdogConfig
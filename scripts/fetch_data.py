@@ -60,21 +60,35 @@ def _write_symbol_data(symbol: str, df: pd.DataFrame, output_dir: Path) -> None:
     print(f"[ok] Wrote {output_path}")
 
 
+def _symbol_frame(data: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    """Pull one ticker out of a batched ``yf.download(..., group_by="ticker")`` result."""
+    if not isinstance(data.columns, pd.MultiIndex):
+        # older yfinance returns flat columns when only one ticker was requested
+        return data
+    if symbol not in data.columns.get_level_values(0):
+        return pd.DataFrame()
+    # rows come from the union of all tickers' dates
+    return data[symbol].dropna(how="all")
+
+
 def main(argv: Sequence[str] | None = None) -> int:
     args = _parse_args(argv)
     output_dir = args.output
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    print(f"[info] Fetching {', '.join(args.symbols)}...")
+    # one batched request; yfinance fetches the tickers concurrently with threads=True
+    data = yf.download(
+        args.symbols,
+        period=args.period,
+        interval=args.interval,
+        auto_adjust=args.auto_adjust,
+        progress=False,
+        group_by="ticker",
+        threads=True,
+    )
     for symbol in args.symbols:
-        print(f"[info] Fetching {symbol}...")
-        data = yf.download(
-            symbol,
-            period=args.period,
-            interval=args.interval,
-            auto_adjust=args.auto_adjust,
-            progress=False,
-        )
-        _write_symbol_data(symbol, data, output_dir)
+        _write_symbol_data(symbol, _symbol_frame(data, symbol), output_dir)
 
     return 0
 
@@ -8,37 +8,41 @@ from __future__ import annotations
 import csv
 import datetime as dt
 import os
-import random
 from typing import List
 
+import numpy as np
+
 SYMS: List[str] = [s.strip() for s in os.environ.get("SAMPLE_SYMS", "SPY,QQQ,TLT").split(",") if s.strip()]
 N = int(os.environ.get("SAMPLE_DAYS", "40"))
 SEED = int(os.environ.get("SAMPLE_SEED", "42"))
 OUT = os.environ.get("SAMPLE_OUT", "data/sample_multi_asset_data.csv")
 
 
+def _price_paths() -> np.ndarray:
+    """(N, len(SYMS)) close prices; each symbol draws from its own seeded stream."""
+    base = 100.0 + 5.0 * np.arange(len(SYMS))
+    factors = np.empty((N, len(SYMS)))
+    for j, sym in enumerate(SYMS):
+        # keyed on the symbol, so its returns do not depend on the rest of SAMPLE_SYMS
+        rng = np.random.default_rng([SEED, sum(ord(ch) for ch in sym)])
+        factors[:, j] = rng.uniform(-0.01, 0.01, N)
+    factors += 1.0
+    return base * np.cumprod(factors, axis=0)
+
+
 def main() -> None:
-    random.seed(SEED)
     start = dt.date(2024, 1, 2)
     cols = ["datetime"] + [f"{sym}_Close" for sym in SYMS]
     out_dir = os.path.dirname(OUT)
     if out_dir:
         os.makedirs(out_dir, exist_ok=True)
 
-    with open(OUT, "w", newline="") as f:
+    paths = _price_paths().round(4)
+    stamps = [(start + dt.timedelta(days=i)).isoformat() + "T00:00:00Z" for i in range(N)]
+    with open(OUT, "w", newline="", buffering=1 << 20) as f:
         writer = csv.writer(f)
         writer.writerow(cols)
-        prices = {sym: 100.0 + 5.0 * idx for idx, sym in enumerate(SYMS)}
-        sym_offsets = {sym: sum(ord(ch) for ch in sym) for sym in SYMS}
-
-        for i in range(N):
-            day = start + dt.timedelta(days=i)
-            row = [day.isoformat() + "T00:00:00Z"]
-            for sym in SYMS:
-                rng = random.Random(SEED + i * 17 + sym_offsets[sym])
-                prices[sym] *= 1.0 + rng.uniform(-0.01, 0.01)
-                row.append(round(prices[sym], 4))
-            writer.writerow(row)
+        writer.writerows(zip(stamps, *paths.T.tolist()))
 
     print(f"wrote {OUT} with {N} rows and syms {SYMS}")
 
@@ -7,37 +7,53 @@ Usage:
     python scripts/run_placebo.py --config configs/etrp.yml --mode shuffle_months
 """
 from __future__ import annotations
-import argparse, sys, yaml
+import argparse, csv, sys, yaml
 from pathlib import Path
 import pandas as pd, numpy as np
-from copy import deepcopy
+try:  # libyaml-backed parser when PyYAML was built with it
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
-import lab.strategies as lab_strategies
-sys.modules.setdefault("strategies", lab_strategies)
-from lab.run import load_prices
+from lab.run import load_price_snapshot, load_prices, with_overrides
 from lab.strategies.etrp import run_etrp
 
-def shuffle_months(px: pd.DataFrame, seed=42) -> pd.DataFrame:
+def shuffle_months_bulk(px: pd.DataFrame, n_reps: int, seed=42):
+    """Yield *n_reps* month-shuffled copies of *px* from one random stream.
+
+    The month grouping, the value buffer and the output index are built once and
+    shared by every replication; only the month order is redrawn each time.
+    """
     rng = np.random.default_rng(seed)
-    # group by month, shuffle the order
-    g = list(px.groupby(px.index.to_period("M")))
-    rng.shuffle(g)
-    df = pd.concat([grp for _, grp in g])
-    df.index = pd.date_range(start=px.index[0], periods=len(df), freq="B")
-    return df
+    # rows grouped by calendar month (stable, so within-month order is kept)
+    periods = px.index.to_period("M").asi8
+    order = np.argsort(periods, kind="stable")
+    _, starts, counts = np.unique(periods[order], return_index=True, return_counts=True)
+    values = px.values
+    index = pd.date_range(start=px.index[0], periods=len(order), freq="B")
+    positions = np.arange(len(order))
+    for _ in range(n_reps):
+        # shuffle the month order, then expand it to one flat row index and gather once
+        perm = rng.permutation(len(starts))
+        lengths = counts[perm]
+        offsets = np.repeat(starts[perm] - (np.cumsum(lengths) - lengths), lengths)
+        row_idx = order[offsets + positions]
+        yield pd.DataFrame(values.take(row_idx, axis=0), index=index, columns=px.columns)
+
+def shuffle_months(px: pd.DataFrame, seed=42) -> pd.DataFrame:
+    return next(shuffle_months_bulk(px, 1, seed))
 
 def permute_within_blocks(px: pd.DataFrame, block_days=21, seed=42) -> pd.DataFrame:
     rng = np.random.default_rng(seed)
-    idx = px.index
-    arr = px.values.copy()
-    n = len(idx)
-    for start in range(0, n, block_days):
-        block = arr[start:start+block_days]
-        rng.shuffle(block)
-        arr[start:start+block_days] = block
-    df = pd.DataFrame(arr, index=idx, columns=px.columns)
+    n = len(px.index)
+    full = n - n % block_days
+    # shuffle row positions within each block in one call, then gather the rows once
+    perm = np.arange(n)
+    perm[:full] = rng.permuted(perm[:full].reshape(-1, block_days), axis=1).ravel()
+    perm[full:] = rng.permutation(perm[full:])
+    df = pd.DataFrame(px.values.take(perm, axis=0), index=px.index, columns=px.columns)
     return df
 
 def main():
@@ -45,9 +61,13 @@ def main():
     ap.add_argument("--config", default="configs/etrp.yml")
     ap.add_argument("--mode", choices=["shuffle_months","permute_blocks"], default="shuffle_months")
     ap.add_argument("--out", default="runs/placebo.csv")
+    ap.add_argument("--cache", default=None,
+                    help="parquet snapshot of the loaded prices, "
+                         "reused while the data settings and price CSVs are unchanged")
     args = ap.parse_args()
 
-    cfg = yaml.safe_load(open(args.config))
+    with open(args.config, "rb") as f:
+        cfg = yaml.load(f, Loader=SafeLoader)
 
     def load_prices_resilient(cfg: dict) -> pd.DataFrame:
         try:
@@ -55,12 +75,13 @@ def main():
         except Exception as exc:
             if cfg.get("data", {}).get("use_synth_if_missing", True):
                 print(f"[placebo] warning: {exc}. Falling back to synthetic data.")
-                cfg2 = deepcopy(cfg)
-                cfg2["data"]["data_dir"] = "__synthetic__"
-                return load_prices(cfg2)
+                return load_prices(with_overrides(cfg, "data", data_dir="__synthetic__"))
             raise
 
-    px = load_prices_resilient(cfg)
+    if args.cache:
+        px = load_price_snapshot(Path(args.cache), cfg, lambda: load_prices_resilient(cfg))
+    else:
+        px = load_prices_resilient(cfg)
 
     if args.mode == "shuffle_months":
         px2 = shuffle_months(px)
@@ -69,11 +90,14 @@ def main():
 
     res = run_etrp(px2, cfg)
     m = {k: float(v) for k,v in res["metrics"].items()}
-    df = pd.DataFrame([m])
     Path(args.out).parent.mkdir(parents=True, exist_ok=True)
-    df.to_csv(args.out, index=False)
+    # a single row: write the dict directly instead of building a DataFrame for it
+    with open(args.out, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=list(m), lineterminator="\n")
+        writer.writeheader()
+        writer.writerow(m)
     print(f"[placebo] saved {args.out}")
-    print(df)
+    print(f"[metrics] CAGR={m['CAGR']:.2%}  VolAnn={m['VolAnn']:.2%}  Sharpe={m['Sharpe']:.2f}  MaxDD={m['MaxDD']:.2%}")
 
 if __name__ == "__main__":
     main()
@@ -7,27 +7,26 @@ Usage:
     python scripts/run_walkforward.py --config configs/etrp.yml --train 5 --test 1
 """
 from __future__ import annotations
-import argparse, sys, yaml
+import argparse, os, sys, yaml
 from pathlib import Path
-from copy import deepcopy
 import pandas as pd
+try:  # libyaml-backed parser when PyYAML was built with it
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
-import lab.strategies as lab_strategies
-sys.modules.setdefault("strategies", lab_strategies)
-from lab.run import load_prices
+from lab.parallel import process_pool
+from lab.run import load_price_snapshot, load_prices, with_overrides
 from lab.strategies.etrp import run_etrp
 
-def rolling_windows(start: pd.Timestamp, end: pd.Timestamp, train_years: int, test_years: int):
-    # month granularity
-    idx = pd.date_range(start, end, freq="M")
-    for i in range(0, len(idx) - (train_years + test_years)*12 + 1, test_years*12):
-        train_start = idx[i]
-        train_end   = idx[i + train_years*12 - 1]
-        test_start  = idx[i + train_years*12]
-        test_end    = idx[min(i + (train_years+test_years)*12 - 1, len(idx)-1)]
-        yield (train_start, train_end, test_start, test_end)
+TRADING_DAYS = 252
+
+def rolling_windows(n: int, train_days: int, test_days: int):
+    # positions on the trading-day index: train [i, i+W), test [i+W, i+W+H); full folds only
+    for i in range(0, n - train_days - test_days + 1, test_days):
+        yield (i, i + train_days, i + train_days, i + train_days + test_days)
 
 def load_prices_resilient(cfg: dict):
     try:
@@ -35,40 +34,53 @@ def load_prices_resilient(cfg: dict):
     except Exception as exc:
         if cfg.get("data", {}).get("use_synth_if_missing", True):
             print(f"[run_fold] warning: {exc}. Falling back to synthetic data.")
-            cfg2 = deepcopy(cfg)
-            cfg2["data"]["data_dir"] = "__synthetic__"
-            return load_prices(cfg2)
+            return load_prices(with_overrides(cfg, "data", data_dir="__synthetic__"))
         raise
 
 
-def run_fold(cfg: dict, start: pd.Timestamp, end: pd.Timestamp) -> dict:
-    cfg2 = deepcopy(cfg)
-    cfg2["backtest"]["start"] = str(start.date())
-    cfg2["backtest"]["end"]   = str(end.date())
-    px = load_prices_resilient(cfg2)
-    res = run_etrp(px, cfg2)
+def run_fold(cfg: dict, px: pd.DataFrame, start: str, end: str) -> dict:
+    # px is this fold's slice of the history loaded once in main(); run_etrp only reads cfg
+    res = run_etrp(px, cfg)
     m = {k: float(v) for k,v in res["metrics"].items()}
-    m.update({"start": str(start.date()), "end": str(end.date())})
+    m.update({"start": start, "end": end})
     return m
 
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--config", default="configs/etrp.yml")
-    ap.add_argument("--train", type=int, default=5, help="train years")
-    ap.add_argument("--test", type=int, default=1, help="test years")
+    ap.add_argument("--train", type=int, default=5, help="train years (252 trading days each)")
+    ap.add_argument("--test", type=int, default=1, help="test years (252 trading days each)")
     ap.add_argument("--out", default="runs/walkforward.csv")
+    ap.add_argument("--cache", default=None,
+                    help="parquet snapshot of the loaded prices, "
+                         "reused while the data settings and price CSVs are unchanged")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                    help="worker processes for the folds (1 runs them in this process)")
     args = ap.parse_args()
 
-    cfg = yaml.safe_load(open(args.config))
-    start = pd.Timestamp(cfg["backtest"]["start"])
-    end   = pd.Timestamp(cfg["backtest"]["end"])
+    with open(args.config, "rb") as f:
+        cfg = yaml.load(f, Loader=SafeLoader)
+    if args.cache:
+        px_all = load_price_snapshot(Path(args.cache), cfg, lambda: load_prices_resilient(cfg))
+    else:
+        px_all = load_prices_resilient(cfg)
 
-    rows = []
-    for tr_start, tr_end, te_start, te_end in rolling_windows(start, end, args.train, args.test):
+    folds = []
+    days = px_all.index
+    for tr0, tr1, te0, te1 in rolling_windows(len(days), args.train * TRADING_DAYS, args.test * TRADING_DAYS):
+        # dates are only needed for the fold labels
+        tr_start, tr_end, te_start, te_end = (str(days[k].date()) for k in (tr0, tr1 - 1, te0, te1 - 1))
         # in a true hyperparam search you'd tune on train here; we just run test
-        print(f"[fold] train {tr_start.date()}→{tr_end.date()} | test {te_start.date()}→{te_end.date()}")
-        m = run_fold(cfg, te_start, te_end)
-        rows.append(m)
+        print(f"[fold] train {tr_start}→{tr_end} | test {te_start}→{te_end}")
+        folds.append((cfg, px_all.iloc[te0:te1], te_start, te_end))
+
+    jobs = min(args.jobs, len(folds))
+    if jobs > 1:
+        # folds are independent, and each worker is sent only its own slice
+        with process_pool(jobs) as ex:
+            rows = list(ex.map(run_fold, *zip(*folds)))
+    else:
+        rows = [run_fold(*fold) for fold in folds]
 
     df = pd.DataFrame(rows)
     Path(args.out).parent.mkdir(parents=True, exist_ok=True)
@@ -1,22 +1,37 @@
+import os
 import yaml, pandas as pd
 from pathlib import Path
-from copy import deepcopy
-from lab.run import load_prices
+from lab.data.stress_zoo import SCENARIOS
+from lab.parallel import process_pool
+from lab.run import _resolve_data_dir, load_prices, with_overrides
 from lab.strategies.etrp import run_etrp
 
-SCENARIOS = ["trend_up","trend_down","mean_revert","regime_switch","vol_spike","jumps","diversification_failure","black_swan"]
+
+def _scenario_cfg(base: dict, scen: str) -> dict:
+    return with_overrides(base, "data", data_dir=f"stress_zoo:{scen}")
+
+
+def _run_one(args):
+    base, scen = args
+    cfg = _scenario_cfg(base, scen)
+    px = load_prices(cfg)
+    res = run_etrp(px, cfg)
+    return scen, {k: float(v) for k, v in res["metrics"].items()}
+
 
 def main():
     with open("configs/etrp.yml","r") as f:
         base = yaml.safe_load(f)
-    rows = []
+    # generate any missing scenario data here so workers never race on writing it
     for scen in SCENARIOS:
-        cfg = deepcopy(base)
-        cfg["data"]["data_dir"] = f"stress_zoo:{scen}"
-        px = load_prices(cfg)
-        res = run_etrp(px, cfg)
-        m = res["metrics"]
-        rows.append({"scenario": scen, **{k: float(v) for k,v in m.items()}})
+        _resolve_data_dir(_scenario_cfg(base, scen))
+    # scenarios are independent backtests: one process each, up to the core count
+    workers = min(len(SCENARIOS), os.cpu_count() or 1)
+    with process_pool(workers) as ex:
+        results = list(ex.map(_run_one, [(base, scen) for scen in SCENARIOS]))
+    rows = []
+    for scen, m in results:
+        rows.append({"scenario": scen, **m})
         print(f"[{scen}] CAGR={m['CAGR']:.2%} Vol={m['VolAnn']:.2%} Sharpe={m['Sharpe']:.2f} MaxDD={m['MaxDD']:.2%}")
     df = pd.DataFrame(rows).set_index("scenario")
     Path("runs").mkdir(exist_ok=True)
@@ -18,10 +18,10 @@ def test_online_learner_updates():
 def test_regime_classifier_basic():
     idx = pd.date_range("2020-01-01", periods=400, freq="B")
     rng = np.random.default_rng(0)
-    # create low-vol then high-vol sequence
-    r = np.zeros((len(idx), 3))
-    r[:200] = rng.normal(0, 0.002, size=(200,3))
-    r[200:] = rng.normal(0, 0.03, size=(200,3))
+    # create low-vol then high-vol sequence: one draw, scaled in place per half
+    r = rng.normal(0, 1, size=(len(idx), 3))
+    r[:200] *= 0.002
+    r[200:] *= 0.03
     df = pd.DataFrame(r, index=idx, columns=["A","B","C"])
     labels = classify_regime(df)
     assert labels.isin(["calm","normal","turbo","panic"]).all()
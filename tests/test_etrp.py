@@ -3,7 +3,22 @@
 import numpy as np
 import pandas as pd
 
-from lab.strategies.etrp import portfolio_returns_monthly, rolling_entropy, etrp_weights
+from lab.strategies.etrp import (
+    etrp_weights,
+    inverse_vol_weights,
+    portfolio_returns_monthly,
+    _rolling_entropy_np,
+    rolling_entropy,
+    rolling_entropy_frame,
+    rolling_entropy_incremental,
+)
+
+
+def _histogram_entropy(values: np.ndarray, bins: int) -> float:
+    """Reference estimator: Shannon entropy of np.histogram bin frequencies."""
+    hist, _ = np.histogram(values, bins=bins)
+    probs = hist[hist > 0] / hist.sum()
+    return float(-np.sum(probs * np.log(probs)))
 
 
 def test_entropy_orders_series() -> None:
@@ -19,15 +34,80 @@ def test_entropy_orders_series() -> None:
     assert entropy_high > entropy_low
 
 
+def test_incremental_entropy_matches_fixed_bin_histogram() -> None:
+    """Incremental updates should reproduce a per-window count over the same edges, NaN/inf windows included."""
+    index = pd.date_range("2020-01-01", periods=300, freq="B")
+    rng = np.random.default_rng(2)
+    series = pd.Series(rng.normal(0, 0.01, len(index)), index=index)
+    series.iloc[100:103] = np.nan
+    series.iloc[200] = np.inf
+    edges = np.quantile(series[np.isfinite(series)], np.linspace(0, 1, 11))
+
+    def brute(window_vals: np.ndarray) -> float:
+        counts = np.bincount(np.searchsorted(edges[1:-1], window_vals, side="right"), minlength=10)
+        probs = counts[counts > 0] / counts.sum()
+        return float(-(probs * np.log(probs)).sum())
+
+    expected = series.rolling(21).apply(brute, raw=True)
+    result = rolling_entropy_incremental(series, 21, 10, edges=edges)
+
+    assert result.isna().equals(expected.isna())
+    assert result.iloc[200:221].isna().all()
+    assert np.allclose(result.dropna(), expected.dropna())
+    # default edges come from the finite sample only
+    pd.testing.assert_series_equal(rolling_entropy_incremental(series, 21, 10), result)
+
+
+def test_rolling_entropy_matches_histogram_estimator() -> None:
+    """Series, frame and NumPy paths should agree with np.histogram, NaN/flat/inf windows included."""
+    index = pd.date_range("2020-01-01", periods=300, freq="B")
+    rng = np.random.default_rng(5)
+    returns = pd.DataFrame(rng.normal(0, 0.01, (len(index), 3)), index=index, columns=["A", "B", "C"])
+    returns.iloc[40, 0] = np.nan
+    returns.iloc[100:160, 1] = 0.0
+    returns.iloc[200, 2] = np.inf
+    returns.iloc[250, 0] = -np.inf
+
+    # rolling() maps ±inf to NaN, so those windows are incomplete like NaN ones
+    expected = returns.rolling(30).apply(lambda v: _histogram_entropy(v, 12), raw=True)
+    assert expected["C"].iloc[200:229].isna().all()
+
+    frame = rolling_entropy_frame(returns, 30, 12)
+    pd.testing.assert_frame_equal(frame, expected, rtol=1e-10)
+    for col in returns.columns:
+        series = rolling_entropy(returns[col], 30, 12)
+        pd.testing.assert_series_equal(series, expected[col], rtol=1e-10)
+        numpy_path = _rolling_entropy_np(returns[col].to_numpy(), 30, 12)
+        np.testing.assert_allclose(numpy_path, expected[col].to_numpy(), rtol=1e-10)
+
+
+def test_inverse_vol_weights_match_rolling_std() -> None:
+    """Cumulative-sum volatility should agree with pandas' rolling std, gaps, infs and flat runs included."""
+    index = pd.date_range("2020-01-01", periods=400, freq="B")
+    rng = np.random.default_rng(3)
+    returns = pd.DataFrame(rng.normal(0, 0.01, (len(index), 3)), index=index, columns=["A", "B", "C"])
+    returns.iloc[:50, 1] = np.nan
+    returns.iloc[200:300, 2] = 0.0
+    returns.iloc[120, 0] = np.inf
+    returns.iloc[350, 1] = -np.inf
+
+    vol = returns.rolling(63).std().replace(0, np.nan)
+    expected = (1.0 / vol).div((1.0 / vol).sum(axis=1), axis=0)
+    result = inverse_vol_weights(returns, 63)
+
+    pd.testing.assert_frame_equal(result, expected, rtol=1e-10)
+    # only the windows holding the inf lose the asset
+    assert result["A"].iloc[120:183].isna().all()
+    assert result["A"].iloc[62:120].notna().all() and result["A"].iloc[183:].notna().all()
+
+
 def test_weights_shape_and_sum() -> None:
     """Monthly weights should sum to unity and produce finite returns."""
     index = pd.date_range("2020-01-01", periods=600, freq="B")
     rng = np.random.default_rng(1)
-    prices = {}
-    for symbol in ["A", "B", "C", "D"]:
-        ret = 0.0002 + rng.normal(0, 0.01, len(index))
-        prices[symbol] = 100 * (1 + pd.Series(ret, index=index)).cumprod()
-    price_df = pd.DataFrame(prices)
+    # one series per symbol (drawn row-wise), transposed to (dates, symbols)
+    rets = 0.0002 + rng.normal(0, 0.01, size=(4, len(index))).T
+    price_df = pd.DataFrame(100 * np.cumprod(1 + rets, axis=0), index=index, columns=list("ABCD"))
 
     weights = etrp_weights(price_df, window_days=63, entropy_bins=20, weight_cap=0.5, target_vol_ann=0.1)
     assert np.allclose(weights.sum(axis=1), 1.0)
@@ -36,3 +116,21 @@ def test_weights_shape_and_sum() -> None:
     portfolio_monthly = portfolio_returns_monthly(returns, weights)
     assert portfolio_monthly.notna().sum() > 0
     assert np.isfinite(portfolio_monthly).all()
+
+
+def test_monthly_returns_skip_months_missing_from_data() -> None:
+    """A month with no rows must not appear as a 0% month."""
+    index = pd.bdate_range("2020-01-01", "2020-12-31")
+    index = index[index.month != 6]
+    rng = np.random.default_rng(2)
+    returns = pd.DataFrame(rng.normal(0, 0.01, (len(index), 2)), index=index, columns=["A", "B"])
+    weights = pd.DataFrame(0.5, index=returns.resample("ME").last().index, columns=["A", "B"])
+
+    monthly = portfolio_returns_monthly(returns, weights)
+    assert len(monthly) == 11
+    assert pd.Timestamp("2020-06-30") not in monthly.index
+
+    # weights take effect the day after the first month-end
+    daily = (returns.sum(axis=1) * 0.5).where(returns.index > "2020-01-31", 0.0)
+    expected = (1 + daily).groupby(daily.index.to_period("M").to_timestamp("M")).prod() - 1
+    np.testing.assert_allclose(monthly.to_numpy(), expected.to_numpy(), rtol=1e-12)
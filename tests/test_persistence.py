@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from lab.adaptive.persistence import save_pickle, load_pickle
+from lab.adaptive.persistence import save_pickle, load_pickle, save_state_json, load_state_json, load_state
 from lab.adaptive.online_learner import OnlineLearnerState
 
 
@@ -19,3 +19,31 @@ def test_pickled_state_roundtrip(tmp_path: Path):
     save_pickle(str(path), reloaded)
     mutated = load_pickle(str(path))
     assert mutated.params["tilt"] == 0.6
+
+
+def test_json_state_roundtrip(tmp_path: Path):
+    path = tmp_path / "state.json"
+    state = OnlineLearnerState(
+        params={"tilt": 0.5, "vol_target": 0.1},
+        adapt_rate=0.02,
+        bounds={"tilt": (0, 1), "vol_target": (0, 1)},
+        ema_cache={"tilt": 0.45},
+    )
+    save_state_json(str(path), state)
+    reloaded = load_state_json(str(path))
+    assert reloaded == state
+
+    reloaded.params["tilt"] = 0.6
+    save_state_json(str(path), reloaded)
+    mutated = load_state_json(str(path))
+    assert mutated.params["tilt"] == 0.6
+    assert mutated.bounds["tilt"] == (0, 1)
+
+
+def test_load_state_reads_json_and_legacy_pickle(tmp_path: Path):
+    state = OnlineLearnerState(params={"tilt": 0.5}, adapt_rate=0.02, bounds={"tilt": (0, 1)})
+    save_state_json(str(tmp_path / "state.json"), state)
+    save_pickle(str(tmp_path / "state.pkl"), state)
+
+    assert load_state(str(tmp_path / "state.json")) == state
+    assert load_state(str(tmp_path / "state.pkl")) == state
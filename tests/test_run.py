@@ -0,0 +1,72 @@
+"""Tests for the price-loading helpers in lab.run."""
+
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from lab.run import _read_combined_csv, _read_prices_from_folder, load_price_snapshot, load_prices
+
+
+def test_combined_csv_with_time_stamped_dates(tmp_path: Path) -> None:
+    """Dates carrying a time part parse the same way pandas reads them."""
+    path = tmp_path / "prices.csv"
+    path.write_text(
+        "Date,SPY,TLT\n"
+        "2018-01-01 16:00:00,100.0,120.0\n"
+        "2018-01-02 16:00:00,101.0,119.5\n"
+    )
+    df = _read_combined_csv(path)
+    expected = pd.read_csv(path, parse_dates=["Date"]).set_index("Date")
+    pd.testing.assert_frame_equal(df, expected, check_index_type=False)
+    assert df.index[0] == pd.Timestamp("2018-01-01 16:00:00")
+
+
+def test_combined_csv_falls_back_for_unknown_date_layout(tmp_path: Path) -> None:
+    """Layouts Arrow cannot parse fall back to pandas instead of raising."""
+    path = tmp_path / "prices.csv"
+    path.write_text("Date,SPY\n01/02/2018,100.0\n01/03/2018,101.0\n")
+    df = _read_combined_csv(path)
+    assert list(df.index) == [pd.Timestamp("2018-01-02"), pd.Timestamp("2018-01-03")]
+
+
+def test_parquet_cache_rejects_replaced_csv_with_older_mtime(tmp_path: Path) -> None:
+    """A prices.csv swapped in with an old mtime (cp -p, unzip) must not be served from cache."""
+    path = tmp_path / "prices.csv"
+    path.write_text("Date,SPY\n2018-01-02,100.0\n2018-01-03,101.0\n")
+    first = _read_prices_from_folder(tmp_path, ["SPY"])
+    assert (tmp_path / "prices.parquet").exists()
+    assert _read_prices_from_folder(tmp_path, ["SPY"]).equals(first)
+
+    path.write_text("Date,SPY\n2018-01-02,200.0\n2018-01-03,202.0\n2018-01-04,204.0\n")
+    os.utime(path, (0, 0))
+    second = _read_prices_from_folder(tmp_path, ["SPY"])
+    assert list(second["SPY"]) == [200.0, 202.0, 204.0]
+
+
+def test_price_snapshot_reloads_for_a_different_config(tmp_path: Path) -> None:
+    """A snapshot written for one universe/date range is not served to another config."""
+    data_dir = tmp_path / "data"
+    data_dir.mkdir()
+    (data_dir / "prices.csv").write_text(
+        "Date,SPY,TLT,QQQ\n2010-01-04,1.0,2.0,3.0\n2012-01-03,1.1,2.1,3.1\n2012-01-04,1.2,2.2,3.2\n"
+    )
+    cache = tmp_path / "snapshot.parquet"
+
+    def cfg(universe, start):
+        return {
+            "data": {"data_dir": str(data_dir), "universe": universe},
+            "backtest": {"start": start, "end": "2012-12-31"},
+        }
+
+    a, b = cfg(["SPY", "TLT"], "2010-01-01"), cfg(["SPY", "QQQ"], "2012-01-01")
+    first = load_price_snapshot(cache, a, lambda: load_prices(a))
+    assert list(first.columns) == ["SPY", "TLT"] and len(first) == 3
+
+    second = load_price_snapshot(cache, b, lambda: load_prices(b))
+    assert list(second.columns) == ["SPY", "QQQ"] and len(second) == 2
+
+    calls = []
+    again = load_price_snapshot(cache, b, lambda: calls.append(1) or load_prices(b))
+    assert not calls
+    pd.testing.assert_frame_equal(again, second, check_freq=False)
@@ -0,0 +1,85 @@
+"""Tests for the resampling and fold helpers in scripts/."""
+
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+SCRIPTS = Path(__file__).resolve().parents[1] / "scripts"
+
+
+def _load(name: str):
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+run_placebo = _load("run_placebo")
+run_walkforward = _load("run_walkforward")
+
+
+def _row_ids(n: int) -> pd.DataFrame:
+    """Frame whose values are the original row positions, so permutations are traceable."""
+    index = pd.bdate_range("2019-01-01", periods=n)
+    return pd.DataFrame({"row": np.arange(n, dtype=float), "neg": -np.arange(n, dtype=float)}, index=index)
+
+
+def test_permute_within_blocks_keeps_rows_in_their_block() -> None:
+    px = _row_ids(100)
+    out = run_placebo.permute_within_blocks(px, block_days=21, seed=3)
+    rows = out["row"].to_numpy().astype(int)
+
+    assert out.index.equals(px.index)
+    assert (out["neg"].to_numpy() == -rows).all()  # rows move whole
+    assert not (rows == np.arange(100)).all()
+    for start in range(0, 100, 21):
+        block = rows[start:start + 21]
+        assert sorted(block) == list(range(start, min(start + 21, 100)))
+
+
+def test_shuffle_months_keeps_months_contiguous() -> None:
+    px = _row_ids(400)
+    months = px.index.to_period("M")
+    original = {str(m): list(np.flatnonzero(months == m)) for m in months.unique()}
+
+    out = run_placebo.shuffle_months(px, seed=11)
+    rows = out["row"].to_numpy().astype(int)
+    assert (out["neg"].to_numpy() == -rows).all()
+    assert len(out) == len(px)
+    assert out.index.equals(pd.bdate_range(px.index[0], periods=len(px)))
+
+    # cut the output wherever the source month changes: each run is one whole month, in order
+    src = months[rows]
+    cuts = np.flatnonzero(src[1:] != src[:-1]) + 1
+    runs = np.split(rows, cuts)
+    assert len(runs) == len(original)
+    assert {str(months[run[0]]): list(run) for run in runs} == original
+    assert [str(months[run[0]]) for run in runs] != list(original)
+
+
+def test_shuffle_months_bulk_draws() -> None:
+    px = _row_ids(400)
+    draws = list(run_placebo.shuffle_months_bulk(px, 4, seed=7))
+
+    assert len(draws) == 4
+    pd.testing.assert_frame_equal(draws[0], run_placebo.shuffle_months(px, seed=7))
+    pd.testing.assert_frame_equal(
+        next(run_placebo.shuffle_months_bulk(px, 1, seed=7)), run_placebo.shuffle_months(px, seed=7)
+    )
+    assert all(d.index is draws[0].index for d in draws)
+    assert len({tuple(d["row"]) for d in draws}) == 4
+    for d in draws:
+        assert sorted(d["row"]) == list(px["row"])
+
+
+def test_rolling_windows_bounds() -> None:
+    assert list(run_walkforward.rolling_windows(10, 4, 2)) == [
+        (0, 4, 4, 6),
+        (2, 6, 6, 8),
+        (4, 8, 8, 10),
+    ]
+    # a trailing partial test window is dropped
+    assert list(run_walkforward.rolling_windows(11, 4, 2))[-1] == (4, 8, 8, 10)
+    assert list(run_walkforward.rolling_windows(5, 4, 2)) == []
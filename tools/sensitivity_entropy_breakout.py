@@ -3,13 +3,20 @@
 from __future__ import annotations
 
 import argparse
+import os
+from multiprocessing.shared_memory import SharedMemory
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional, Tuple
 
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 
+try:  # numba is optional; without it the pandas path in _compute_sharpe is used
+    from numba import njit
+except ImportError:  # pragma: no cover - exercised only without numba
+    njit = None
+
 from backtest.core.data import (
     ensure_datetime_index,
     infer_periods_per_year,
@@ -18,6 +25,7 @@ from backtest.core.data import (
 )
 from backtest.core.engine import run_backtest
 from backtest.strategies.praetorian import ThePraetorianEngine
+from lab.parallel import process_pool
 
 
 def _load_frame(path: Path) -> pd.DataFrame:
@@ -34,7 +42,39 @@ def _load_frame(path: Path) -> pd.DataFrame:
     return frame
 
 
+def _sharpe_loop(eq: np.ndarray, periods: float) -> float:
+    """Annualised Sharpe of the simple returns of *eq* (population std), NaN returns skipped.
+
+    Two passes over *eq* (mean, then squared deviations) with no returns array.
+    """
+    s = 0.0
+    c = 0
+    for i in range(1, eq.shape[0]):
+        r = eq[i] / eq[i - 1] - 1.0
+        if r == r:
+            s += r
+            c += 1
+    if c == 0:
+        return 0.0
+    mean = s / c
+    ss = 0.0
+    for i in range(1, eq.shape[0]):
+        r = eq[i] / eq[i - 1] - 1.0
+        if r == r:
+            ss += (r - mean) * (r - mean)
+    std = np.sqrt(ss / c)
+    if std <= 0:
+        return 0.0
+    return mean / std * np.sqrt(periods)
+
+
+_sharpe_nb = njit(cache=True, nogil=True)(_sharpe_loop) if njit is not None else None
+
+
 def _compute_sharpe(equity: pd.Series) -> float:
+    if _sharpe_nb is not None:
+        periods = infer_periods_per_year(equity.index)
+        return float(_sharpe_nb(equity.to_numpy(dtype=np.float64), float(periods)))
     returns = equity.pct_change().dropna()
     if returns.empty:
         return 0.0
@@ -46,40 +86,93 @@ def _compute_sharpe(equity: pd.Series) -> float:
     return float(mean / std * np.sqrt(periods))
 
 
-def run_sensitivity(frame: pd.DataFrame, out_path: Path) -> None:
+def _grid_params(entropy_threshold: float, breakout_period: int) -> Dict[str, object]:
+    return dict(
+        entropy_lookback=40,
+        entry_entropy_threshold=entropy_threshold,
+        breakout_period=breakout_period,
+        ema_fast=21,
+        ema_slow=100,
+        vwap_len=20,
+        vwap_max_distance_atr=1.0,
+        base_risk_percent=1.0,
+        turbo=1,
+        nr7=1,
+        conviction_gain=0.25,
+        conviction_loss=0.50,
+        min_conviction=0.5,
+        max_conviction=1.75,
+    )
+
+
+def _eval(frame: pd.DataFrame, params: Dict[str, object]) -> float:
+    strategy = ThePraetorianEngine(params)
+    result = run_backtest(
+        frame,
+        strategy,
+        mode="target",
+        atr_len=14,
+        risk_R=1.0,
+        risk_pct=0.01,
+        maxR_per_day=3.0,
+    )
+    return _compute_sharpe(result.equity_curve)
+
+
+_worker_frame: Optional[pd.DataFrame] = None
+_worker_shm: Optional[SharedMemory] = None
+
+
+def _share_frame(frame: pd.DataFrame) -> Tuple[SharedMemory, tuple]:
+    """Copy the float64 columns into one shared block, one contiguous row per column.
+
+    Returns the block and the picklable spec workers need to rebuild the frame.
+    Other columns (e.g. integer volume) keep their dtype and travel pickled, so
+    workers see the same inputs as the in-process path.
+    """
+    numeric: List[str] = frame.select_dtypes(include=[np.float64]).columns.tolist()
+    values = frame[numeric].to_numpy(dtype=np.float64).T
+    shm = SharedMemory(create=True, size=max(values.nbytes, 1))
+    np.ndarray(values.shape, dtype=np.float64, buffer=shm.buf)[:] = values
+    spec = (shm.name, values.shape, numeric, frame.index, frame.drop(columns=numeric))
+    return shm, spec
+
+
+def _init_worker(name: str, shape: tuple, numeric: List[str], index: pd.Index, rest: pd.DataFrame) -> None:
+    global _worker_frame, _worker_shm
+    _worker_shm = SharedMemory(name=name)
+    values = np.ndarray(shape, dtype=np.float64, buffer=_worker_shm.buf)
+    # (columns, T) is pandas' own block layout, so the frame wraps the shared pages without copying
+    frame = pd.DataFrame(values.T, index=index, columns=numeric, copy=False)
+    if len(rest.columns):
+        # the remaining columns travel pickled; float ones come first (columns are used by name)
+        frame = pd.concat([frame, rest], axis=1, copy=False)
+    _worker_frame = frame
+
+
+def _eval_in_worker(params: Dict[str, object]) -> float:
+    return _eval(_worker_frame, params)
+
+
+def run_sensitivity(frame: pd.DataFrame, out_path: Path, jobs: Optional[int] = None) -> None:
     ent_vals = [0.010, 0.012, 0.015, 0.018, 0.020]
     brk_vals = [30, 40, 55, 70, 90]
-    z = np.zeros((len(ent_vals), len(brk_vals)))
-
-    for i, entropy_threshold in enumerate(ent_vals):
-        for j, breakout_period in enumerate(brk_vals):
-            params: Dict[str, object] = dict(
-                entropy_lookback=40,
-                entry_entropy_threshold=entropy_threshold,
-                breakout_period=breakout_period,
-                ema_fast=21,
-                ema_slow=100,
-                vwap_len=20,
-                vwap_max_distance_atr=1.0,
-                base_risk_percent=1.0,
-                turbo=1,
-                nr7=1,
-                conviction_gain=0.25,
-                conviction_loss=0.50,
-                min_conviction=0.5,
-                max_conviction=1.75,
-            )
-            strategy = ThePraetorianEngine(params)
-            result = run_backtest(
-                frame,
-                strategy,
-                mode="target",
-                atr_len=14,
-                risk_R=1.0,
-                risk_pct=0.01,
-                maxR_per_day=3.0,
-            )
-            z[i, j] = _compute_sharpe(result.equity_curve)
+    grid = [_grid_params(e, b) for e in ent_vals for b in brk_vals]
+
+    # every cell is an independent backtest on the same read-only frame
+    jobs = min(jobs or os.cpu_count() or 1, len(grid))
+    if jobs > 1:
+        # workers map the prices from one shared-memory block instead of each receiving a pickled copy
+        shm, spec = _share_frame(frame)
+        try:
+            with process_pool(jobs, initializer=_init_worker, initargs=spec) as ex:
+                scores = list(ex.map(_eval_in_worker, grid))
+        finally:
+            shm.close()
+            shm.unlink()
+    else:
+        scores = [_eval(frame, params) for params in grid]
+    z = np.asarray(scores).reshape(len(ent_vals), len(brk_vals))
 
     fig, ax = plt.subplots(figsize=(8, 5))
     im = ax.imshow(z, cmap="viridis", origin="lower", aspect="auto")
@@ -105,12 +198,18 @@ def main() -> None:
         default="artifacts/sensitivity_entropy_breakout.png",
         help="Output image path",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="Worker processes for the grid (default: all cores; 1 runs in-process)",
+    )
     args = parser.parse_args()
 
     csv_path = Path(args.csv)
     frame = _load_frame(csv_path)
     out_path = Path(args.out)
-    run_sensitivity(frame, out_path)
+    run_sensitivity(frame, out_path, jobs=args.jobs)
 
 
 if __name__ == "__main__":  # pragma: no cover - manual usage